@@ -0,0 +1,120 @@
+"""In-process ring buffer that batches audit rows into bulk inserts."""
+import atexit
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class AuditBuffer:
+    """Collect row dicts in memory and flush them with one ``executemany``.
+
+    A background thread flushes whenever ``flush_size`` rows are waiting or
+    ``flush_interval`` seconds have passed. When the buffer is full the oldest
+    rows are dropped and counted, so a burst can never block the request path.
+    """
+
+    def __init__(self, app, db, table, *, capacity=10000, flush_size=200,
+                 flush_interval=1.0):
+        self.app = app
+        self.db = db
+        self.table = table
+        self.capacity = max(1, int(capacity))
+        self.flush_size = max(1, int(flush_size))
+        self.flush_interval = float(flush_interval)
+
+        self._rows = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._atexit_registered = False
+        self.dropped = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    def append(self, row):
+        """Queue one row; never touches the database."""
+        with self._lock:
+            if len(self._rows) == self.capacity:
+                self.dropped += 1
+            self._rows.append(row)
+            pending = len(self._rows)
+        if self._thread is None:
+            self.start()
+        if pending >= self.flush_size:
+            self._wakeup.set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-buffer", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Write every buffered row in a single transaction. Returns the count."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._rows)
+                self._rows.clear()
+            if not batch:
+                return 0
+            try:
+                with self.app.app_context():
+                    with self.db.engine.begin() as conn:
+                        conn.execute(self.table.insert(), batch)
+            except Exception:
+                self.failed_flushes += 1
+                logger.exception("Audit flush of %s row(s) failed", len(batch))
+                with self._lock:
+                    # Put the batch back in front of newer rows, within capacity.
+                    room = self.capacity - len(self._rows)
+                    requeue = batch[-room:] if room > 0 else []
+                    self.dropped += len(batch) - len(requeue)
+                    self._rows.extendleft(reversed(requeue))
+                return 0
+            self.flushed += len(batch)
+            return len(batch)
+
+    def stop(self, timeout=5.0):
+        """Stop the flusher, write what is left and log the final counters."""
+        thread = self._thread
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout)
+            self._thread = None
+        self.flush()
+        stats = self.stats()
+        if stats["pending"] or stats["dropped"]:
+            logger.warning(
+                "Audit buffer stopped with %s pending and %s dropped event(s)",
+                stats["pending"],
+                stats["dropped"],
+            )
+        return stats
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._rows)
+        return {
+            "pending": pending,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
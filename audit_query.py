@@ -0,0 +1,128 @@
+"""Filtering, keyset pagination and streaming export for audit tables."""
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class AuditQueryError(ValueError):
+    """Raised for malformed filter or cursor arguments."""
+
+
+def _parse_time(value, name):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise AuditQueryError(f"Invalid '{name}' timestamp: {value}") from None
+
+
+def _parse_bool(value, name):
+    lowered = value.strip().lower()
+    if lowered in {"1", "true", "yes"}:
+        return True
+    if lowered in {"0", "false", "no"}:
+        return False
+    raise AuditQueryError(f"Invalid '{name}' flag: {value}")
+
+
+def encode_cursor(row):
+    return f"{row.created_at.isoformat()}|{row.id}"
+
+
+def decode_cursor(cursor):
+    created_at, _, row_id = (cursor or "").rpartition("|")
+    try:
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise AuditQueryError(f"Invalid cursor: {cursor}") from None
+
+
+def auth_event_filters(model, args):
+    """Translate request args into SQLAlchemy conditions on ``AuthEvent``.
+
+    Supported: ``username``, ``user_id``, ``ip``, ``event_type``, ``status``,
+    ``success``, ``since`` and ``until`` (ISO 8601, ``until`` exclusive).
+    """
+    conditions = []
+    if args.get("username"):
+        conditions.append(model.username == args["username"])
+    if args.get("user_id"):
+        try:
+            conditions.append(model.user_id == int(args["user_id"]))
+        except ValueError:
+            raise AuditQueryError(f"Invalid 'user_id': {args['user_id']}") from None
+    if args.get("ip"):
+        conditions.append(model.ip_address == args["ip"])
+    if args.get("event_type"):
+        conditions.append(model.event_type == args["event_type"])
+    if args.get("status"):
+        conditions.append(model.status == args["status"])
+    if args.get("success"):
+        conditions.append(model.success.is_(_parse_bool(args["success"], "success")))
+    if args.get("since"):
+        conditions.append(model.created_at >= _parse_time(args["since"], "since"))
+    if args.get("until"):
+        conditions.append(model.created_at < _parse_time(args["until"], "until"))
+    return conditions
+
+
+def page(query, model, conditions, cursor=None, limit=100):
+    """Return ``(rows, next_cursor)`` newest first, resuming after ``cursor``."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        conditions = [
+            *conditions,
+            or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id),
+            ),
+        ]
+    rows = (
+        query.filter(*conditions)
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def iter_all(query, model, conditions, batch_size=EXPORT_BATCH_SIZE):
+    """Yield every matching row, loading one keyset batch at a time."""
+    cursor = None
+    while True:
+        rows, cursor = page(query, model, conditions, cursor, batch_size)
+        yield from rows
+        if cursor is None:
+            return
+
+
+def row_to_dict(row, columns):
+    values = {}
+    for name in columns:
+        value = getattr(row, name)
+        values[name] = value.isoformat() if isinstance(value, datetime) else value
+    return values
+
+
+def ndjson_lines(rows, columns):
+    for row in rows:
+        yield json.dumps(row_to_dict(row, columns)) + "\n"
+
+
+def csv_lines(rows, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        values = row_to_dict(row, columns)
+        writer.writerow(["" if values[name] is None else values[name] for name in columns])
+        if buffer.tell() >= 65536:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,177 @@
+"""Rollup, archival and bounded-batch pruning for the audit tables."""
+import gzip
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+import audit_query
+
+logger = logging.getLogger(__name__)
+
+
+def _archive_path(archive_dir, table_name, stamp):
+    os.makedirs(archive_dir, exist_ok=True)
+    return os.path.join(archive_dir, f"{table_name}-{stamp}.ndjson.gz")
+
+
+# Groups per upsert statement; keeps bound parameters well under SQLite's limit.
+ROLLUP_CHUNK_SIZE = 1000
+
+
+def _dialect_insert(session):
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"Audit rollup has no upsert for {dialect}")
+    return insert
+
+
+def _rollup(session, daily_model, rows):
+    """Add per-day counts by (event_type, status, ip_address) for ``rows``.
+
+    One ``INSERT ... ON CONFLICT DO UPDATE`` per chunk of groups, so the purge
+    transaction does not look up each group first.
+    """
+    counts = Counter(
+        (row.created_at.date(), row.event_type, row.status, row.ip_address or "")
+        for row in rows
+    )
+    values = [
+        {
+            "day": day,
+            "event_type": event_type,
+            "status": status,
+            "ip_address": ip_address,
+            "count": count,
+        }
+        for (day, event_type, status, ip_address), count in counts.items()
+    ]
+    table = daily_model.__table__
+    insert = _dialect_insert(session)
+    for start in range(0, len(values), ROLLUP_CHUNK_SIZE):
+        statement = insert(table).values(values[start:start + ROLLUP_CHUNK_SIZE])
+        statement = statement.on_conflict_do_update(
+            index_elements=["day", "event_type", "status", "ip_address"],
+            set_={"count": table.c.count + statement.excluded["count"]},
+        )
+        session.execute(statement)
+
+
+def _prune_table(session, model, time_column, cutoff, batch_size, archive_file,
+                 on_batch=None):
+    """Archive and delete rows older than ``cutoff`` in ``batch_size`` chunks."""
+    columns = [column.name for column in model.__table__.columns]
+    deleted = 0
+    while True:
+        rows = (
+            session.query(model)
+            .filter(time_column < cutoff)
+            .order_by(model.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return deleted
+
+        ids = [row.id for row in rows]
+        # Serialized now, written only once the delete commits, so a retried
+        # batch is never archived twice.
+        lines = (
+            [line.encode("utf-8") for line in audit_query.ndjson_lines(rows, columns)]
+            if archive_file is not None
+            else None
+        )
+        if on_batch is not None:
+            on_batch(rows)
+        removed = (
+            session.query(model)
+            .filter(model.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        if removed != len(ids):
+            # Another pruner got here first; undo this batch's rollup and retry.
+            session.rollback()
+            continue
+        session.commit()
+        if lines is not None:
+            archive_file.writelines(lines)
+        session.expunge_all()
+        deleted += removed
+
+
+def prune_audit_tables(db, event_model, session_model, daily_model, *,
+                       retention_days, batch_size=5000, archive_dir=None,
+                       vacuum_pages=2000):
+    """Roll up, archive and delete audit rows older than ``retention_days``.
+
+    Returns a dict with the number of deleted events and sessions.
+    """
+    session = db.session
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    stats = {"cutoff": cutoff.isoformat(timespec="seconds")}
+
+    targets = (
+        (event_model, event_model.created_at, lambda rows: _rollup(session, daily_model, rows)),
+        (session_model, session_model.login_at, None),
+    )
+    for model, time_column, on_batch in targets:
+        table_name = model.__tablename__
+        if archive_dir:
+            path = _archive_path(archive_dir, table_name, stamp)
+            with gzip.open(path, "wb") as archive_file:
+                deleted = _prune_table(
+                    session, model, time_column, cutoff, batch_size, archive_file, on_batch
+                )
+            if not deleted:
+                os.remove(path)
+        else:
+            deleted = _prune_table(
+                session, model, time_column, cutoff, batch_size, None, on_batch
+            )
+        stats[table_name] = deleted
+
+    stats["vacuumed_pages"] = incremental_vacuum(db.engine, vacuum_pages)
+    return stats
+
+
+def incremental_vacuum(engine, pages):
+    """Return freed pages to the OS when the database uses incremental auto-vacuum."""
+    if engine.dialect.name != "sqlite" or not pages:
+        return 0
+    with engine.connect() as conn:
+        mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+        if mode != 2:
+            logger.warning(
+                "auto_vacuum is not INCREMENTAL, so pruned pages stay in the file; "
+                "run `flask --app main enable-incremental-vacuum` once to convert it"
+            )
+            return 0
+        free_before = conn.execute(text("PRAGMA freelist_count")).scalar()
+        conn.exec_driver_sql(f"PRAGMA incremental_vacuum({int(pages)})")
+        free_after = conn.execute(text("PRAGMA freelist_count")).scalar()
+        conn.commit()
+    return free_before - free_after
+
+
+def enable_incremental_vacuum(engine):
+    """Switch an existing SQLite file to ``auto_vacuum=INCREMENTAL``.
+
+    The pragma only applies to new files until a full ``VACUUM`` rebuilds the
+    database, which rewrites every page and holds the write lock meanwhile.
+    Returns False when there was nothing to do.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+            return False
+        conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")
+        return conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2
@@ -0,0 +1,139 @@
+"""Measure requests/s against a running server or one started for the run.
+
+Usage:
+    python benchmarks/bench_load_test.py --server dev --concurrency 16 --duration 10
+    python benchmarks/bench_load_test.py --server gunicorn --paths / /health/live
+    python benchmarks/bench_load_test.py --url http://127.0.0.1:8000 --duration 30
+
+``--server dev`` starts ``flask run`` (threaded development server) and
+``--server gunicorn`` starts ``gunicorn -c gunicorn.conf.py wsgi:app``, each
+against a fresh temporary SQLite database. Results are printed as JSON.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, port):
+    workdir = tempfile.mkdtemp(prefix=f"load-{kind}-")
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+        EMAIL_DELIVERY_MODE="mock",
+        METRICS_ENABLED=os.getenv("METRICS_ENABLED", "1"),
+    )
+    if kind == "dev":
+        command = [
+            sys.executable, "-m", "flask", "--app", "main", "run",
+            "--port", str(port), "--no-reload",
+        ]
+    else:
+        command = [
+            sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+            "--bind", f"127.0.0.1:{port}", "--access-logfile", "/dev/null", "wsgi:app",
+        ]
+    process = subprocess.Popen(
+        command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{base_url}/health/live", timeout=1)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+def run_load(base_url, paths, concurrency, duration):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(index):
+        session = requests.Session()
+        own_latencies, own_errors = [], 0
+        i = index
+        while time.perf_counter() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + path, timeout=10)
+                if response.status_code >= 500:
+                    own_errors += 1
+            except requests.RequestException:
+                own_errors += 1
+            own_latencies.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own_latencies)
+            errors.append(own_errors)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(0.50) if latencies else None,
+        "p99_ms": percentile(0.99) if latencies else None,
+        "errors": sum(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=["dev", "gunicorn"], default="dev")
+    parser.add_argument("--url", help="Benchmark an already running server instead.")
+    parser.add_argument("--paths", nargs="+", default=["/", "/projects", "/health/live"])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        base_url, label = args.url.rstrip("/"), args.url
+    else:
+        process, base_url = start_server(args.server, free_port())
+        label = args.server
+    try:
+        result = run_load(base_url, args.paths, args.concurrency, args.duration)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+    print(json.dumps({"server": label, "concurrency": args.concurrency, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Compare login throughput with and without the SQLite performance profile.
+
+Usage:
+    python benchmarks/bench_login_throughput.py --threads 8 --requests 2000
+
+Each profile runs in a fresh subprocess against its own temporary SQLite file.
+Benchmark users get a 1-iteration PBKDF2 hash so the numbers reflect database
+write contention rather than password hashing cost.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_child(profile, threads, total_requests, users):
+    workdir = tempfile.mkdtemp(prefix=f"bench-{profile}-")
+    os.environ["SQLITE_PROFILE"] = profile
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["EMAIL_DELIVERY_MODE"] = "mock"
+    os.environ["LOGIN_MAX_ATTEMPTS"] = "1000000"
+    os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "0"
+    os.environ["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1"
+    sys.path.insert(0, ROOT)
+
+    from werkzeug.security import generate_password_hash
+
+    import main
+
+    with main.app.app_context():
+        main.bootstrap_schema()
+        password_hash = generate_password_hash(
+            "bench-password", os.environ["PASSWORD_HASH_METHOD"]
+        )
+        main.db.session.add_all(
+            main.User(username=f"bench{i}", password_hash=password_hash)
+            for i in range(users)
+        )
+        main.db.session.commit()
+
+    per_thread = total_requests // threads
+    errors = []
+
+    def worker(index):
+        for i in range(per_thread):
+            client = main.app.test_client()
+            password = "bench-password" if i % 2 == 0 else "wrong-password"
+            response = client.post(
+                "/login",
+                data={"username": f"bench{(index + i) % users}", "password": password},
+            )
+            if response.status_code not in (302, 401):
+                errors.append(response.status_code)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    done = per_thread * threads
+    print(
+        json.dumps(
+            {
+                "profile": profile,
+                "requests": done,
+                "seconds": round(elapsed, 3),
+                "requests_per_second": round(done / elapsed, 1),
+                "errors": len(errors),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--profiles", default="default,performance")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.threads, args.requests, args.users)
+        return
+
+    results = []
+    for profile in args.profiles.split(","):
+        output = subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--child",
+                profile,
+                "--threads",
+                str(args.threads),
+                "--requests",
+                str(args.requests),
+                "--users",
+                str(args.users),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'profile':<12} {'requests':>9} {'seconds':>9} {'req/s':>9} {'errors':>7}")
+    for row in results:
+        print(
+            f"{row['profile']:<12} {row['requests']:>9} {row['seconds']:>9} "
+            f"{row['requests_per_second']:>9} {row['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
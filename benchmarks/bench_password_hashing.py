@@ -0,0 +1,99 @@
+"""Measure password hashing throughput and login-verify latency per pool size.
+
+Usage:
+    python benchmarks/bench_password_hashing.py --pool-sizes 0,1,2,4 --concurrency 16
+
+Each run verifies a password from ``--concurrency`` threads, the way concurrent
+logins would, through a ``PasswordHasher`` with the given process pool size
+(``0`` = hash on the calling thread). Requests rejected with ``HashingBusy``
+are counted separately and are the ones the app answers with 429.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from password_hashing import HashingBusy, PasswordHasher  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(method, workers, concurrency, per_thread, max_pending):
+    hasher = PasswordHasher(method, workers=workers, max_pending=max_pending)
+    stored = generate_password_hash("bench-password", hasher.method)
+    hasher.verify(stored, "bench-password")  # warm up the process pool
+
+    latencies = []
+    rejected = [0]
+    lock = threading.Lock()
+
+    def worker():
+        local, busy = [], 0
+        for _ in range(per_thread):
+            started = time.perf_counter()
+            try:
+                hasher.verify(stored, "bench-password")
+            except HashingBusy:
+                busy += 1
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+            rejected[0] += busy
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+
+    return {
+        "workers": workers,
+        "hashes_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "rejected": rejected[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--method", default=os.getenv("PASSWORD_HASH_METHOD", "scrypt"))
+    parser.add_argument("--pool-sizes", default="0,1,2,4")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-thread", type=int, default=5)
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=0,
+        help="hashing slots (default: unbounded, so latency shows queueing)",
+    )
+    args = parser.parse_args()
+
+    print(f"method={args.method} concurrency={args.concurrency}")
+    print(f"{'workers':>7} {'hashes/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'429s':>6}")
+    for size in (int(value) for value in args.pool_sizes.split(",")):
+        max_pending = args.max_pending or args.concurrency
+        row = run(args.method, size, args.concurrency, args.per_thread, max_pending)
+        print(
+            f"{row['workers']:>7} {row['hashes_per_second']:>9.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['rejected']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
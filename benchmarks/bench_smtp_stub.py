@@ -0,0 +1,108 @@
+"""Minimal local SMTP server that accepts and counts every message.
+
+Usage:
+    python benchmarks/bench_smtp_stub.py --port 2525
+
+It speaks just enough SMTP for ``smtplib``: EHLO/HELO, AUTH PLAIN/LOGIN
+(any credentials), MAIL, RCPT, DATA, RSET, NOOP and QUIT. No STARTTLS, so
+point the app at it with ``SMTP_STARTTLS=0``.
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        try:
+            self.converse()
+        except (ConnectionResetError, BrokenPipeError):
+            pass  # the client hung up mid-session; keep tracebacks out of the report
+
+    def converse(self):
+        self.reply("220 smtp-stub ready")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-smtp-stub")
+                self.reply("250-AUTH PLAIN LOGIN")
+                self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 smtp-stub")
+            elif verb == "AUTH":
+                if command.upper().startswith("AUTH LOGIN"):
+                    if len(command.split()) < 3:
+                        self.reply("334 VXNlcm5hbWU6")
+                        self.rfile.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                self.reply("235 Authentication successful")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                self.server.record_message()
+                self.reply("250 OK queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            elif verb in {"MAIL", "RCPT", "RSET", "NOOP"}:
+                self.reply("250 OK")
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.messages = 0
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def record_message(self):
+        with self._count_lock:
+            self.messages += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    args = parser.parse_args()
+
+    stub = SMTPStub(args.host, args.port).start()
+    print(f"SMTP stub listening on {args.host}:{stub.port}")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"messages received: {stub.messages}")
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
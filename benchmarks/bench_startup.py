@@ -0,0 +1,120 @@
+"""Measure cold-start cost: ``import main`` and the first request.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --top 15 --output startup.json
+    python benchmarks/bench_startup.py --max-ms 1500   # exit 1 when over budget
+
+Each measurement runs in a fresh interpreter against a temporary SQLite
+database. ``-X importtime`` attributes import time to modules. The first
+request is timed twice, once with an empty Jinja bytecode cache and once with
+the cache the first run left behind.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time: self [us] | cumulative | imported package"
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+client = main.app.test_client()
+response = client.get("/")
+done = time.perf_counter()
+print(json.dumps({
+    "status": response.status_code,
+    "import_ms": round((imported - started) * 1000, 1),
+    "first_request_ms": round((done - imported) * 1000, 1),
+}))
+"""
+
+
+def environment(workdir):
+    return dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+        JINJA_BYTECODE_CACHE_DIR=os.path.join(workdir, "jinja-cache"),
+        EMAIL_DELIVERY_MODE="mock",
+        PYTHONDONTWRITEBYTECODE="0",
+    )
+
+
+def import_profile(env, top):
+    """Run ``python -X importtime -c 'import main'`` and rank top-level imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    modules, total = [], 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        depth, name, cumulative = len(match.group(3)), match.group(4), int(match.group(2))
+        # Children are printed before their parent. A top-level entry (one space)
+        # closes a group: keep main's direct imports (three spaces), drop the rest.
+        if depth == 1:
+            if name == "main":
+                total = cumulative
+                break
+            modules = []
+        elif depth == 3:
+            modules.append((name, cumulative))
+    ranked = sorted(modules, key=lambda item: -item[1])
+    return {
+        "import_main_ms": round(total / 1000, 1),
+        "top_imports_ms": {name: round(us / 1000, 1) for name, us in ranked[:top]},
+    }
+
+
+def probe(env):
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="Also write the JSON result to this file.")
+    parser.add_argument(
+        "--max-ms", type=float,
+        help="Fail when import plus cold first request exceeds this many ms.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="startup-") as workdir:
+        env = environment(workdir)
+        result = import_profile(env, args.top)
+        result["cold_cache"] = probe(env)
+        result["warm_cache"] = probe(env)
+
+    cold = result["cold_cache"]
+    result["cold_start_ms"] = round(cold["import_ms"] + cold["first_request_ms"], 1)
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    if args.max_ms is not None and result["cold_start_ms"] > args.max_ms:
+        print(
+            f"cold start {result['cold_start_ms']} ms exceeds budget {args.max_ms} ms",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+"""Benchmark the main request paths in-process and over a real WSGI server.
+
+Usage:
+    python benchmarks/bench_suite.py --users 1000 --events 50000 --requests 300
+    python benchmarks/bench_suite.py --save-baseline
+    python benchmarks/bench_suite.py --baseline benchmarks/results/baseline.json --fail-on-regression
+
+Every mode runs in a fresh subprocess on its own seeded SQLite database and
+sends contact mail to a local SMTP stub. ``client`` drives ``app.test_client()``
+and ``wsgi`` drives a threaded werkzeug server over HTTP. Each scenario reports
+throughput and p50/p95/p99 latency. Results are written as JSON and compared
+with a saved baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_smtp_stub import SMTPStub  # noqa: E402
+
+PASSWORD = "bench-password"
+ADMIN = "bench-admin"
+# Users are split into pools so failures never lock the success/failure users.
+LOCKED_USERS = 20
+SCENARIOS = (
+    "home",
+    "projects",
+    "login_success",
+    "login_failure",
+    "login_lockout",
+    "admin_list",
+    "admin_search",
+    "contact_submit",
+)
+
+
+# --- Child process: environment, seeding and scenarios ---
+def configure_environment(workdir, smtp_port, hash_method):
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        EMAIL_DELIVERY_MODE="smtp",
+        SMTP_SERVER="127.0.0.1",
+        SMTP_PORT=str(smtp_port),
+        SMTP_STARTTLS="0",
+        SMTP_USERNAME="bench",
+        SMTP_PASSWORD="bench",
+        CONTACT_TO_ADDRESS="bench@example.com",
+        PASSWORD_HASH_METHOD=hash_method,
+        LOGIN_RATE_LIMIT_ENABLED="0",
+        CONTACT_RATE_LIMIT_ENABLED="0",
+        AUDIT_RETENTION_INTERVAL_HOURS="0",
+        SESSION_SWEEP_INTERVAL_MINUTES="0",
+    )
+    sys.path.insert(0, ROOT)
+
+
+def seed(main, users, events):
+    from werkzeug.security import generate_password_hash
+
+    password_hash = generate_password_hash(PASSWORD, os.environ["PASSWORD_HASH_METHOD"])
+    now = datetime.utcnow()
+    locked_until = now + timedelta(days=1)
+    user_rows = [
+        {
+            "username": ADMIN,
+            "password_hash": password_hash,
+            "enabled": True,
+            "is_admin": True,
+            "failed_login_attempts": 0,
+            "lock_until": None,
+            "created_at": now,
+        }
+    ]
+    user_rows.extend(
+        {
+            "username": f"user{i:06d}",
+            "password_hash": password_hash,
+            "enabled": True,
+            "is_admin": False,
+            "failed_login_attempts": 0,
+            "lock_until": locked_until if i < LOCKED_USERS else None,
+            "created_at": now,
+        }
+        for i in range(users)
+    )
+    event_types = ("login_success", "login_failed", "logout", "login_locked")
+    event_rows = [
+        {
+            "created_at": now - timedelta(seconds=i * 50),
+            "username": f"user{i % max(users, 1):06d}",
+            "event_type": event_types[i % len(event_types)],
+            "status": "success" if i % 4 in (0, 2) else "failed",
+            "success": i % 4 in (0, 2),
+            "ip_address": f"10.0.{i % 250}.{i % 200}",
+            "request_path": "/login",
+        }
+        for i in range(events)
+    ]
+    with main.app.app_context():
+        main.bootstrap_schema()
+        with main.db.engine.begin() as conn:
+            for offset in range(0, len(user_rows), 5000):
+                conn.execute(main.User.__table__.insert(), user_rows[offset:offset + 5000])
+            for offset in range(0, len(event_rows), 5000):
+                conn.execute(
+                    main.AuthEvent.__table__.insert(), event_rows[offset:offset + 5000]
+                )
+
+
+def scenario_request(name, i, users):
+    """Return ``(method, path, kwargs, expected_statuses, needs_admin, fresh)``."""
+    if name == "home":
+        return "GET", "/", {}, {200}, False, False
+    if name == "projects":
+        return "GET", "/projects", {}, {200}, False, False
+    normal = max(users - LOCKED_USERS, 1)
+    if name == "login_success":
+        username = f"user{LOCKED_USERS + i % normal:06d}"
+        data = {"username": username, "password": PASSWORD}
+        return "POST", "/login", {"data": data}, {302}, False, True
+    if name == "login_failure":
+        # Spread over every unlocked user so none reaches LOGIN_MAX_ATTEMPTS.
+        username = f"user{LOCKED_USERS + (i * 7919) % normal:06d}"
+        data = {"username": username, "password": "wrong-password"}
+        return "POST", "/login", {"data": data}, {401, 429}, False, True
+    if name == "login_lockout":
+        data = {"username": f"user{i % LOCKED_USERS:06d}", "password": PASSWORD}
+        return "POST", "/login", {"data": data}, {429}, False, True
+    if name == "admin_list":
+        return "GET", "/user-admin", {}, {200}, True, False
+    if name == "admin_search":
+        return "GET", f"/user-admin?q=user{i % 1000:03d}", {}, {200}, True, False
+    if name == "contact_submit":
+        payload = {
+            "firstName": "Bench",
+            "lastName": "Mark",
+            "email": f"sender{i}@example.com",
+            "the_email": f"Benchmark contact message number {i} with enough text.",
+        }
+        return "POST", "/send_email", {"json": payload}, {200, 202}, False, False
+    raise ValueError(f"Unknown scenario {name}")
+
+
+class TestClientTransport:
+    def __init__(self, app):
+        self.app = app
+
+    def session(self, admin):
+        client = self.app.test_client()
+        if admin:
+            client.post("/login", data={"username": ADMIN, "password": PASSWORD})
+        return client
+
+    def send(self, client, method, path, kwargs, fresh):
+        if fresh:
+            client = self.app.test_client()
+        return client.open(path, method=method, **kwargs).status_code
+
+
+class HTTPTransport:
+    def __init__(self, base_url):
+        import requests
+
+        self.requests = requests
+        self.base_url = base_url
+
+    def session(self, admin):
+        session = self.requests.Session()
+        if admin:
+            session.post(
+                self.base_url + "/login",
+                data={"username": ADMIN, "password": PASSWORD},
+                allow_redirects=False,
+            )
+        return session
+
+    def send(self, session, method, path, kwargs, fresh):
+        sender = self.requests if fresh else session
+        response = sender.request(
+            method, self.base_url + path, allow_redirects=False, timeout=30, **kwargs
+        )
+        return response.status_code
+
+
+def percentile(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 3)
+
+
+def run_scenario(transport, name, total, concurrency, users):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    per_thread = max(1, total // concurrency)
+    needs_admin = scenario_request(name, 0, users)[4]
+
+    def worker(index):
+        session = transport.session(needs_admin)
+        own, failed = [], 0
+        for n in range(per_thread):
+            method, path, kwargs, expected, _, fresh = scenario_request(
+                name, index * per_thread + n, users
+            )
+            started = time.perf_counter()
+            try:
+                status = transport.send(session, method, path, kwargs, fresh)
+            except Exception:
+                status = None
+            own.append(time.perf_counter() - started)
+            if status not in expected:
+                failed += 1
+        with lock:
+            latencies.extend(own)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "errors": sum(errors),
+    }
+
+
+def run_child(args):
+    workdir = tempfile.mkdtemp(prefix=f"bench-{args.child}-")
+    configure_environment(workdir, args.smtp_port, args.hash_method)
+    import main
+
+    seed(main, args.users, args.events)
+    if args.child == "serve":
+        from werkzeug.serving import make_server
+
+        server = make_server("127.0.0.1", args.port, main.app, threaded=True)
+        print("ready", flush=True)
+        server.serve_forever()
+        return
+
+    transport = TestClientTransport(main.app)
+    results = {
+        name: run_scenario(transport, name, args.requests, args.concurrency, args.users)
+        for name in args.scenarios
+    }
+    main.shutdown_background_workers()
+    print(json.dumps(results))
+
+
+# --- Parent process: orchestration, reporting and baselines ---
+def _child_command(args, mode, smtp_port, port=0):
+    return [
+        sys.executable, os.path.abspath(__file__),
+        "--child", mode,
+        "--smtp-port", str(smtp_port),
+        "--port", str(port),
+        "--users", str(args.users),
+        "--events", str(args.events),
+        "--requests", str(args.requests),
+        "--concurrency", str(args.concurrency),
+        "--hash-method", args.hash_method,
+        "--scenarios", *args.scenarios,
+    ]
+
+
+def run_client_mode(args, smtp_port):
+    output = subprocess.run(
+        _child_command(args, "client", smtp_port),
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_wsgi_mode(args, smtp_port):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        _child_command(args, "serve", smtp_port, port),
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        if process.stdout.readline().strip() != "ready":
+            raise RuntimeError("benchmark server failed to start")
+        transport = HTTPTransport(f"http://127.0.0.1:{port}")
+        return {
+            name: run_scenario(transport, name, args.requests, args.concurrency, args.users)
+            for name in args.scenarios
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def compare(results, baseline, tolerance):
+    """Print deltas against ``baseline``; return the list of regressions."""
+    regressions = []
+    print(f"\n{'mode/scenario':<28} {'req/s':>9} {'Δ':>8} {'p95 ms':>9} {'Δ':>8}")
+    for mode, scenarios in results["results"].items():
+        for name, row in scenarios.items():
+            old = baseline.get("results", {}).get(mode, {}).get(name)
+            if not old:
+                continue
+            rps_delta = row["requests_per_second"] / old["requests_per_second"] - 1
+            p95_delta = row["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0.0
+            flag = ""
+            if rps_delta < -tolerance or p95_delta > tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{mode}/{name}")
+            print(
+                f"{mode + '/' + name:<28} {row['requests_per_second']:>9} "
+                f"{rps_delta:>+8.1%} {row['p95_ms']:>9} {p95_delta:>+8.1%}{flag}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", choices=["client", "wsgi"],
+                        default=["client", "wsgi"])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=400, help="Per scenario.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--hash-method", default="pbkdf2:sha256:1000",
+                        help="Password hash for seeded users (scrypt = production cost).")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed req/s drop or p95 rise before flagging (0.10 = 10%%).")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--child", choices=["client", "serve"], help=argparse.SUPPRESS)
+    parser.add_argument("--smtp-port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.users <= LOCKED_USERS:
+        parser.error(f"--users must be greater than {LOCKED_USERS}")
+
+    if args.child:
+        run_child(args)
+        return
+
+    stub = SMTPStub().start()
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            **{key: getattr(args, key) for key in (
+                "users", "events", "requests", "concurrency", "hash_method"
+            )},
+        },
+        "results": {},
+    }
+    runners = {"client": run_client_mode, "wsgi": run_wsgi_mode}
+    try:
+        for mode in args.modes:
+            results["results"][mode] = runners[mode](args, stub.port)
+    finally:
+        time.sleep(1)  # Let the outbox workers finish their last sends.
+        results["meta"]["smtp_messages_received"] = stub.messages
+        stub.stop()
+
+    print(f"{'mode/scenario':<28} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for mode, scenarios in results["results"].items():
+        for name, row in scenarios.items():
+            print(
+                f"{mode + '/' + name:<28} {row['requests_per_second']:>9} {row['p50_ms']:>8} "
+                f"{row['p95_ms']:>8} {row['p99_ms']:>8} {row['errors']:>7}"
+            )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
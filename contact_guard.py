@@ -0,0 +1,57 @@
+"""Duplicate-message suppression for the contact form."""
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def message_fingerprint(message, sender=""):
+    """Hash ``sender`` and ``message`` after folding case, accents, punctuation and spacing.
+
+    Resubmissions from the same address that only differ in those details
+    share a fingerprint; the same short text from two senders does not.
+    """
+    text = unicodedata.normalize("NFKD", message or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _NON_WORD.sub(" ", text.casefold()).strip()
+    sender = (sender or "").strip().casefold()
+    return hashlib.sha256(f"{sender}\n{text}".encode("utf-8")).hexdigest()
+
+
+class DuplicateFilter:
+    """Remember recent fingerprints for ``ttl`` seconds, at most ``maxsize`` of them."""
+
+    def __init__(self, *, ttl=3600, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = max(1, int(maxsize))
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def is_duplicate(self, fingerprint):
+        now = time.monotonic()
+        with self._lock:
+            expires = self._seen.get(fingerprint)
+            if expires is None:
+                return False
+            if expires <= now:
+                del self._seen[fingerprint]
+                return False
+            self.duplicates += 1
+            return True
+
+    def remember(self, fingerprint):
+        with self._lock:
+            self._seen[fingerprint] = time.monotonic() + self.ttl
+            self._seen.move_to_end(fingerprint)
+            while len(self._seen) > self.maxsize:
+                self._seen.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._seen)
+        return {"entries": size, "duplicates": self.duplicates}
@@ -0,0 +1,213 @@
+"""Durable outbox queue and background workers for contact-form email delivery."""
+import logging
+import random
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, update
+
+logger = logging.getLogger(__name__)
+
+
+class EmailQueue:
+    """Drain a SQLAlchemy outbox table with a pool of background worker threads.
+
+    Rows move through ``pending`` -> ``sending`` -> ``sent``; failed sends are
+    rescheduled with exponential backoff until ``max_attempts`` is reached, at
+    which point the row is dead-lettered (``status='dead'``).
+    """
+
+    def __init__(
+        self,
+        app,
+        db,
+        model,
+        deliver,
+        *,
+        workers=2,
+        max_attempts=5,
+        backoff_seconds=30,
+        max_backoff_seconds=3600,
+        poll_seconds=2.0,
+        lease_seconds=300,
+        permanent_errors=(ValueError,),
+    ):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.deliver = deliver
+        self.workers = max(0, int(workers))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_seconds = max(0, int(backoff_seconds))
+        self.max_backoff_seconds = max(self.backoff_seconds, int(max_backoff_seconds))
+        self.poll_seconds = float(poll_seconds)
+        self.lease_seconds = int(lease_seconds)
+        self.permanent_errors = tuple(permanent_errors)
+
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    # --- Producer side ---
+    def enqueue(self, **fields):
+        """Add a message to the outbox in the caller's session (not committed)."""
+        message = self.model(
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.utcnow(),
+            **fields,
+        )
+        self.db.session.add(message)
+        return message
+
+    def notify(self):
+        """Wake idle workers after new messages were committed."""
+        self._wakeup.set()
+
+    # --- Worker lifecycle ---
+    @property
+    def started(self):
+        return bool(self._threads)
+
+    def start(self):
+        """Start the worker pool once; extra calls are no-ops."""
+        if self._threads or self.workers == 0:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"email-queue-{index + 1}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Signal workers to exit after their current message and join them."""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    processed = self.process_next()
+            except Exception:
+                logger.exception("Email queue worker error")
+                processed = False
+
+            if not processed:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    # --- Consumer side ---
+    def _claim_next(self):
+        """Atomically move the next due message to ``sending`` and return it."""
+        model = self.model
+        session = self.db.session
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=self.lease_seconds)
+
+        candidates = (
+            session.query(model.id)
+            .filter(
+                (
+                    (model.status == "pending") & (model.next_attempt_at <= now)
+                )
+                | ((model.status == "sending") & (model.locked_at < lease_expired))
+            )
+            .order_by(model.next_attempt_at.asc(), model.id.asc())
+            .limit(self.workers + 1)
+            .all()
+        )
+        for (message_id,) in candidates:
+            claimed = session.execute(
+                update(model)
+                .where(
+                    model.id == message_id,
+                    (
+                        (model.status == "pending")
+                        | (
+                            (model.status == "sending")
+                            & (model.locked_at < lease_expired)
+                        )
+                    ),
+                )
+                .values(status="sending", locked_at=now, attempts=model.attempts + 1)
+            )
+            session.commit()
+            if claimed.rowcount:
+                return session.get(model, message_id)
+        return None
+
+    def _retry_delay(self, attempts):
+        delay = min(
+            self.max_backoff_seconds, self.backoff_seconds * (2 ** (attempts - 1))
+        )
+        return delay + random.uniform(0, delay * 0.1)
+
+    def process_next(self):
+        """Deliver one due message. Returns False when nothing was due."""
+        message = self._claim_next()
+        if message is None:
+            return False
+
+        session = self.db.session
+        try:
+            self.deliver(message)
+        except Exception as exc:
+            permanent = isinstance(exc, self.permanent_errors)
+            message.last_error = f"{type(exc).__name__}: {exc}"[:255]
+            message.locked_at = None
+            if permanent or message.attempts >= self.max_attempts:
+                message.status = "dead"
+                logger.error(
+                    "Email %s dead-lettered after %s attempt(s): %s",
+                    message.id,
+                    message.attempts,
+                    message.last_error,
+                )
+            else:
+                message.status = "pending"
+                message.next_attempt_at = datetime.utcnow() + timedelta(
+                    seconds=self._retry_delay(message.attempts)
+                )
+                logger.warning(
+                    "Email %s failed (attempt %s), retrying at %s",
+                    message.id,
+                    message.attempts,
+                    message.next_attempt_at.isoformat(timespec="seconds"),
+                )
+        else:
+            message.status = "sent"
+            message.sent_at = datetime.utcnow()
+            message.locked_at = None
+            message.last_error = None
+        session.commit()
+        return True
+
+    def drain(self, limit=None):
+        """Process due messages inline until none are left (or ``limit`` hit)."""
+        processed = 0
+        while limit is None or processed < limit:
+            if not self.process_next():
+                break
+            processed += 1
+        return processed
+
+    def stats(self):
+        """Return message counts keyed by status."""
+        rows = (
+            self.db.session.query(self.model.status, func.count(self.model.id))
+            .group_by(self.model.status)
+            .all()
+        )
+        return {status: count for status, count in rows}
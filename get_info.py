@@ -1,87 +1,473 @@
+import json
 import os
-import requests
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+
+import runtime_settings
+from lazy_imports import lazy_module
+
+# Loaded on first use: most processes never enrich names.
+requests = lazy_module("requests")
 
 # --- External API endpoints ---
 AGIFY_LINK = "https://api.agify.io"
 GEN_LINK = "https://api.genderize.io"
+# agify/genderize accept at most 10 ``name[]`` values per request.
+NAME_BATCH_SIZE = 10
+
+
+# --- Name enrichment cache ---
+class NameCache:
+    """Thread-safe TTL + LRU cache with an optional SQLite backing store."""
+
+    def __init__(self, maxsize=4096, ttl=86400, path=""):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            with closing(sqlite3.connect(path)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS name_cache "
+                    "(key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL)"
+                )
+
+    def _disk(self):
+        return closing(sqlite3.connect(self.path, timeout=5))
+
+    def get_many(self, keys):
+        """Return ``{key: value}`` for every key that is cached and fresh."""
+        now = time.time()
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[0]
+                else:
+                    self._entries.pop(key, None)
+                    missing.append(key)
+
+        if missing and self.path:
+            placeholders = ",".join("?" * len(missing))
+            with self._disk() as conn:
+                rows = conn.execute(
+                    f"SELECT key, value, expires_at FROM name_cache "
+                    f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*missing, now),
+                ).fetchall()
+            with self._lock:
+                for key, value, expires_at in rows:
+                    found[key] = json.loads(value)
+                    self._remember(key, found[key], expires_at)
+        return found
+
+    def _remember(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set_many(self, items):
+        """Store ``{key: value}`` pairs for ``ttl`` seconds."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value, expires_at)
+        if items and self.path:
+            with self._disk() as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO name_cache (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    [(key, json.dumps(value), expires_at) for key, value in items.items()],
+                )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with self._disk() as conn, conn:
+                conn.execute("DELETE FROM name_cache")
+
+
+_http_session = None
+_name_cache = None
+_enrich_lock = threading.Lock()
+
+
+def _get_http_session():
+    """Return the shared keep-alive session used for enrichment lookups."""
+    global _http_session
+    with _enrich_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def get_name_cache():
+    """Return the shared enrichment cache configured from the environment."""
+    global _name_cache
+    with _enrich_lock:
+        if _name_cache is None:
+            _name_cache = NameCache(
+                maxsize=int(os.getenv("NAME_CACHE_SIZE", "4096")),
+                ttl=int(os.getenv("NAME_CACHE_TTL", "86400")),
+                path=(os.getenv("NAME_CACHE_PATH") or "").strip(),
+            )
+        return _name_cache
+
+
+def _fetch_field(url, field, names, timeout):
+    """Look up ``field`` for ``names`` using the batch ``name[]`` form."""
+    session = _get_http_session()
+    results = {}
+    for offset in range(0, len(names), NAME_BATCH_SIZE):
+        chunk = names[offset : offset + NAME_BATCH_SIZE]
+        response = session.get(url, params={"name[]": chunk}, timeout=timeout)
+        response.raise_for_status()
+        for item in response.json():
+            results[item["name"].lower()] = item.get(field)
+    return results
 
 
 # --- Name-based enrichment helpers ---
+def enrich_names(names, *, cache=None, agify_url=None, genderize_url=None):
+    """Return ``{name: {"age": ..., "gender": ...}}`` for each requested name.
+
+    Cached values are served locally; the remaining names are looked up in
+    batches, with the agify and genderize requests running concurrently.
+    """
+    cache = cache or get_name_cache()
+    timeout = runtime_settings.current().name_api_timeout
+    keys = list(dict.fromkeys(name.strip().lower() for name in names if name.strip()))
+
+    cached = cache.get_many([f"{field}:{key}" for key in keys for field in ("age", "gender")])
+    pending = {
+        field: [key for key in keys if f"{field}:{key}" not in cached]
+        for field in ("age", "gender")
+    }
+
+    lookups = {
+        "age": agify_url or AGIFY_LINK,
+        "gender": genderize_url or GEN_LINK,
+    }
+    jobs = {field: lookups[field] for field, todo in pending.items() if todo}
+    if jobs:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {
+                field: executor.submit(_fetch_field, url, field, pending[field], timeout)
+                for field, url in jobs.items()
+            }
+            fetched = {}
+            for field, future in futures.items():
+                for key, value in future.result().items():
+                    fetched[f"{field}:{key}"] = value
+        cache.set_many(fetched)
+        cached.update(fetched)
+
+    result = {}
+    for name in names:
+        key = name.strip().lower()
+        result[name] = {
+            "age": cached.get(f"age:{key}"),
+            "gender": cached.get(f"gender:{key}"),
+        }
+    return result
+
+
 def get_age(name):
     """Return the estimated age for a given first name."""
-    data_age = {"name": name}
-
-    value = requests.get(AGIFY_LINK, params=data_age)
-    return str(value.json()["age"])  # Reterning the possible Age
+    return str(enrich_names([name])[name]["age"])  # Reterning the possible Age
 
 
 def get_sex(name):
     """Return the estimated gender for a given first name."""
-    data_sex = {"name": name}
+    return str(enrich_names([name])[name]["gender"])  # Reterning the Gender
+
+
+# --- SMTP connection pooling ---
+class _PooledConnection:
+    """An authenticated SMTP session plus the time it was last handed back."""
+
+    def __init__(self, server):
+        self.server = server
+        self.last_used = time.monotonic()
 
-    value = requests.get(GEN_LINK, params=data_sex)
-    return str(value.json()["gender"])  # Reterning the Gender
+
+class SMTPConnectionPool:
+    """Keep a bounded set of authenticated SMTP sessions open between sends."""
+
+    def __init__(
+        self,
+        host,
+        port,
+        username="",
+        password="",
+        *,
+        use_ssl=False,
+        starttls=True,
+        timeout=20,
+        size=2,
+        idle_timeout=60,
+        health_check_after=5,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls and not use_ssl
+        self.timeout = timeout
+        self.size = max(1, int(size))
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._closed = False
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                server.ehlo()
+        if self.username:
+            server.login(self.username, self.password)
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.server.quit()
+        except (smtplib.SMTPException, OSError):
+            try:
+                conn.server.close()
+            except OSError:
+                pass
+
+    def _is_healthy(self, conn):
+        idle_for = time.monotonic() - conn.last_used
+        if idle_for > self.idle_timeout:
+            return False
+        if idle_for < self.health_check_after:
+            return True
+        try:
+            return conn.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def _checkin(self, conn):
+        conn.last_used = time.monotonic()
+        with self._lock:
+            if not self._closed:
+                self._idle.append(conn)
+                return
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow an authenticated ``smtplib`` session from the pool."""
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except OSError as exc:
+            # Broken sockets are never returned to the pool; SMTP-level
+            # rejections leave the session usable.
+            if conn is not None and (
+                isinstance(exc, smtplib.SMTPServerDisconnected)
+                or not isinstance(exc, smtplib.SMTPException)
+            ):
+                self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._checkin(conn)
+            self._slots.release()
+
+    def _sendmail(self, conn, from_address, to_address, payload):
+        try:
+            conn.server.sendmail(from_address, to_address, payload)
+        except smtplib.SMTPServerDisconnected:
+            # The relay dropped an idle session; reconnect once and retry.
+            self._discard(conn)
+            fresh = self._connect()
+            conn.server = fresh.server
+            conn.server.sendmail(from_address, to_address, payload)
+
+    def send(self, from_address, to_address, payload):
+        """Send one already-serialized message over a pooled session."""
+        with self.connection() as conn:
+            self._sendmail(conn, from_address, to_address, payload)
+
+    def send_many(self, messages):
+        """Send ``(from, to, payload)`` tuples over one session.
+
+        Returns a list with ``None`` for each delivered message and the raised
+        ``SMTPException`` for each refused one.
+        """
+        results = []
+        with self.connection() as conn:
+            for from_address, to_address, payload in messages:
+                try:
+                    self._sendmail(conn, from_address, to_address, payload)
+                    results.append(None)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError,
+                        smtplib.SMTPSenderRefused) as exc:
+                    conn.server.rset()
+                    results.append(exc)
+        return results
+
+    def close(self):
+        """Close all idle sessions; borrowed ones are closed on return."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool(settings):
+    """Return the shared pool, rebuilding it when SMTP settings change."""
+    global _pool, _pool_key
+    key = (
+        settings["server"],
+        settings["port"],
+        settings["username"],
+        settings["password"],
+        settings["use_ssl"],
+        settings["starttls"],
+        settings["timeout"],
+        settings["pool_size"],
+        settings["pool_idle_timeout"],
+    )
+    with _pool_lock:
+        if _pool is None or _pool_key != key:
+            if _pool is not None:
+                _pool.close()
+            _pool = SMTPConnectionPool(
+                settings["server"],
+                settings["port"],
+                settings["username"],
+                settings["password"],
+                use_ssl=settings["use_ssl"],
+                starttls=settings["starttls"],
+                timeout=settings["timeout"],
+                size=settings["pool_size"],
+                idle_timeout=settings["pool_idle_timeout"],
+            )
+            _pool_key = key
+        return _pool
 
 
 # --- Contact email delivery via SMTP ---
-def send_email(fName, lName, email, message):
-    """Send a contact-form email using SMTP settings from environment variables."""
-    # SMTP server settings from environment
-    smtp_server = os.getenv("SMTP_SERVER", "smtp.mail.yahoo.com")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_username = (os.getenv("SMTP_USERNAME") or "").strip()
-    smtp_password = (os.getenv("SMTP_PASSWORD") or "").strip()
-    smtp_use_ssl = os.getenv("SMTP_USE_SSL", "0") == "1"
-    smtp_timeout = int(os.getenv("SMTP_TIMEOUT", "20"))
-
-    # Recipient and optional overrides
-    to_address = (os.getenv("CONTACT_TO_ADDRESS") or "").strip()
-    from_override = (os.getenv("CONTACT_FROM_ADDRESS") or "").strip()
-    from_address = from_override or smtp_username
-    subject = (
-        os.getenv("CONTACT_SUBJECT", "Message from portfolio contact form") or ""
-    ).strip() or "Message from portfolio contact form"
+def smtp_settings():
+    """Return SMTP settings from the current snapshot, validating required ones."""
+    config = runtime_settings.current()
 
     # Validate required configuration
     missing = [
         name for name, val in [
-            ("SMTP_USERNAME", smtp_username),
-            ("SMTP_PASSWORD", smtp_password),
-            ("CONTACT_TO_ADDRESS", to_address),
+            ("SMTP_USERNAME", config.smtp_username),
+            ("SMTP_PASSWORD", config.smtp_password),
+            ("CONTACT_TO_ADDRESS", config.contact_to_address),
         ] if not val
     ]
     if missing:
         raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
-    # Build email body
+    return {
+        "server": config.smtp_server,
+        "port": config.smtp_port,
+        "username": config.smtp_username,
+        "password": config.smtp_password,
+        # Yahoo supports STARTTLS (587) and SSL/TLS (465).
+        "use_ssl": config.smtp_use_ssl or config.smtp_port == 465,
+        "starttls": config.smtp_starttls,
+        "timeout": config.smtp_timeout,
+        "pool_size": config.smtp_pool_size,
+        "pool_idle_timeout": config.smtp_pool_idle_timeout,
+        "to_address": config.contact_to_address,
+        "from_address": config.contact_from_address or config.smtp_username,
+        "subject": config.contact_subject,
+    }
+
+
+def build_contact_message(fName, lName, email, message, settings):
+    """Build the MIME message for one contact-form submission."""
     body = (
         f"The name of the client: {fName} {lName}\n"
         f"The email of the client: {email}\n"
         f"Message: {message}"
     )
 
-    # Create the email message
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     msg = MIMEMultipart()
-    msg["From"] = from_address
-    msg["To"] = to_address
-    msg["Subject"] = subject
+    msg["From"] = settings["from_address"]
+    msg["To"] = settings["to_address"]
+    msg["Subject"] = settings["subject"]
     msg.attach(MIMEText(body, "plain"))
+    return msg
 
-    # Establish the SMTP connection and deliver the message.
-    # Yahoo supports STARTTLS (587) and SSL/TLS (465).
-    use_ssl = smtp_use_ssl or smtp_port == 465
-    if use_ssl:
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=smtp_timeout) as server:
-            server.login(smtp_username, smtp_password)
-            server.sendmail(from_address, to_address, msg.as_string())
-        return
-
-    with smtplib.SMTP(smtp_server, smtp_port, timeout=smtp_timeout) as server:
-        server.ehlo()
-        server.starttls()
-        server.ehlo()
-        server.login(smtp_username, smtp_password)
-        server.sendmail(from_address, to_address, msg.as_string())
+
+def send_email(fName, lName, email, message):
+    """Send a contact-form email using the current SMTP settings."""
+    settings = smtp_settings()
+    msg = build_contact_message(fName, lName, email, message, settings)
+    get_smtp_pool(settings).send(
+        settings["from_address"], settings["to_address"], msg.as_string()
+    )
+
+
+def send_emails(submissions):
+    """Send many ``(fName, lName, email, message)`` tuples over one SMTP session.
+
+    Returns one entry per submission: ``None`` when delivered, otherwise the
+    SMTP error the relay answered with.
+    """
+    settings = smtp_settings()
+    payloads = [
+        (
+            settings["from_address"],
+            settings["to_address"],
+            build_contact_message(*submission, settings).as_string(),
+        )
+        for submission in submissions
+    ]
+    if not payloads:
+        return []
+    return get_smtp_pool(settings).send_many(payloads)
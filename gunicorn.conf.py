@@ -0,0 +1,69 @@
+"""Gunicorn settings for production: ``gunicorn -c gunicorn.conf.py wsgi:app``."""
+import multiprocessing
+import os
+
+from runtime_settings import read_dotenv
+
+# Import the app once in the master; migrations run in on_starting, not on
+# every worker's first request.
+os.environ.setdefault("DB_AUTO_MIGRATE", "0")
+
+_dotenv = read_dotenv()
+
+
+def _setting(name):
+    return os.getenv(name) or _dotenv.get(name)
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(_setting("WEB_CONCURRENCY") or multiprocessing.cpu_count() * 2 + 1)
+# Every worker owns a password-hashing pool; split the cores between them
+# rather than letting each worker size its pool for the whole machine.
+if not _setting("PASSWORD_HASH_WORKERS"):
+    os.environ["PASSWORD_HASH_WORKERS"] = str(max(1, multiprocessing.cpu_count() // workers))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+
+
+def on_starting(server):
+    import main
+
+    with main.app.app_context():
+        main.bootstrap_schema()
+        # Workers must not inherit the master's pooled connections.
+        main.db.engine.dispose()
+
+
+def post_fork(server, worker):
+    import main
+
+    with main.app.app_context():
+        main.db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    import main
+
+    # gunicorn resets SIGHUP in workers; `kill -HUP <worker>` reloads settings in place.
+    main.runtime_settings.store.install_signal_handler()
+
+
+def on_reload(server):
+    import main
+
+    # `kill -HUP <master>`: refresh the master's snapshot so the replacement
+    # workers it forks start with the new settings.
+    main.runtime_settings.store.reload()
+
+
+def worker_exit(server, worker):
+    import main
+
+    main.shutdown_background_workers(timeout=graceful_timeout)
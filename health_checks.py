@@ -0,0 +1,155 @@
+"""Cached, time-bounded dependency checks for readiness probes."""
+import logging
+import shutil
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+class CheckFailed(Exception):
+    """Raised by a check to report a failure with a short, safe detail."""
+
+
+class HealthChecks:
+    """Run named checks at most once per ``ttl`` and never wait past ``timeout``.
+
+    A check is a callable returning an optional detail; raising means failure.
+    While a slow check is still running, callers get its previous result (or a
+    timeout) instead of starting a second copy, so probes cannot pile up.
+    """
+
+    def __init__(self, *, ttl=5.0, timeout=2.0):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._checks = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health")
+
+    def register(self, name, func, *, ttl=None, timeout=None):
+        self._checks[name] = {
+            "func": func,
+            "ttl": self.ttl if ttl is None else ttl,
+            "timeout": self.timeout if timeout is None else timeout,
+            "result": None,
+            "expires": 0.0,
+            "future": None,
+        }
+
+    def _execute(self, func):
+        started = time.perf_counter()
+        try:
+            detail = func()
+            ok = True
+        except CheckFailed as exc:
+            ok, detail = False, str(exc)
+        except Exception as exc:
+            logger.warning("Health check failed: %s", exc)
+            ok, detail = False, type(exc).__name__
+        result = {"ok": ok, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+        if detail is not None:
+            result["detail"] = detail
+        return result
+
+    def _submit(self, check):
+        with self._lock:
+            if check["future"] is None:
+                check["future"] = self._executor.submit(self._execute, check["func"])
+            return check["future"]
+
+    def _store(self, check, future, result):
+        with self._lock:
+            if check["future"] is future:
+                check["future"] = None
+            check["result"] = result
+            check["expires"] = time.monotonic() + check["ttl"]
+
+    def run(self):
+        """Return ``(all_ok, {name: result})``, reusing results younger than ``ttl``."""
+        now = time.monotonic()
+        pending = {}
+        results = {}
+        for name, check in self._checks.items():
+            if check["result"] is not None and check["expires"] > now:
+                results[name] = dict(check["result"], cached=True)
+            else:
+                pending[name] = self._submit(check)
+
+        for name, future in pending.items():
+            check = self._checks[name]
+            deadline = check["timeout"]
+            try:
+                result = future.result(timeout=deadline)
+            except TimeoutError:
+                result = {
+                    "ok": False,
+                    "latency_ms": round(deadline * 1000, 2),
+                    "detail": "timed out",
+                }
+                # Keep the future; the next probe after ``ttl`` waits on it again.
+                with self._lock:
+                    check["result"] = result
+                    check["expires"] = time.monotonic() + check["ttl"]
+            else:
+                self._store(check, future, result)
+            results[name] = dict(result, cached=False)
+
+        return all(result["ok"] for result in results.values()), results
+
+
+# --- Stock checks ---
+def database_check(engine, statement="SELECT 1", busy_timeout=1.0):
+    """Round-trip a read-only ``statement``; never takes a write lock.
+
+    On SQLite the connection's ``busy_timeout`` is lowered to ``busy_timeout``
+    seconds for the read, so a locked database fails the check before the
+    probe's own timeout instead of waiting out the pool's setting.
+    """
+    def check():
+        with engine.connect() as conn:
+            if engine.dialect.name != "sqlite":
+                conn.execute(text(statement))
+                return
+            previous = conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+            conn.exec_driver_sql(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+            try:
+                conn.execute(text(statement))
+            finally:
+                conn.exec_driver_sql(f"PRAGMA busy_timeout = {int(previous)}")
+
+    return check
+
+
+def disk_check(path, min_free_mb):
+    def check():
+        free_mb = shutil.disk_usage(path).free // (1024 * 1024)
+        if free_mb < min_free_mb:
+            raise CheckFailed(f"{free_mb} MB free, need {min_free_mb} MB")
+        return f"{free_mb} MB free"
+
+    return check
+
+
+def tcp_check(address_factory, timeout):
+    """Open and close a TCP connection to ``address_factory()`` -> (host, port)."""
+    def check():
+        host, port = address_factory()
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+        return f"{host}:{port} reachable"
+
+    return check
+
+
+def backlog_check(count_factory, max_backlog):
+    def check():
+        backlog = count_factory()
+        if backlog > max_backlog:
+            raise CheckFailed(f"{backlog} queued, limit {max_backlog}")
+        return f"{backlog} queued"
+
+    return check
@@ -0,0 +1,35 @@
+"""Defer loading of heavy modules until one of their attributes is used."""
+import importlib
+import importlib.util
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in that imports the real module on first attribute access.
+
+    The import goes through ``importlib.import_module``, whose per-module
+    locks make concurrent first accesses wait for one complete import
+    (``importlib.util.LazyLoader`` is not thread-safe before Python 3.12).
+    """
+
+    def __getattr__(self, attr):
+        module = self.__dict__.get("_lazy_target")
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_target"] = module
+        return getattr(module, attr)
+
+
+def lazy_module(name):
+    """Return ``name`` as a lazily imported module, or ``None`` if not installed.
+
+    The module body only runs on first attribute access, so importing a
+    file that references it stays cheap for processes that never use it.
+    """
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:  # a missing parent package
+        return None
+    if spec is None:
+        return None
+    return _LazyModule(name)
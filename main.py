@@ -1,17 +1,24 @@
 import os
 import sys
+import threading
+import time
 from datetime import datetime, timedelta
 from functools import wraps
 
 from flask import (
     Flask,
+    Response,
+    abort,
+    g,
     jsonify,
     redirect,
     render_template as rt,
     request,
     session,
+    stream_with_context,
     url_for,
 )
+import click
 from flask_cors import CORS
 from flask_login import (
     LoginManager,
@@ -21,38 +28,39 @@ from flask_login import (
     login_user,
     logout_user,
 )
+from flask.sessions import SecureCookieSessionInterface
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import inspect, text
-from sqlalchemy.exc import OperationalError
-from werkzeug.security import check_password_hash, generate_password_hash
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import delete, text, update
+from sqlalchemy.engine import make_url
 
+import audit_query
+import audit_retention
 import get_info as gt
+import health_checks
+import metrics
+import rate_limit
+import runtime_settings
+import schema_migrations
+import sql_profiler
+import sqlite_profile
+import user_bulk
+from audit_buffer import AuditBuffer
+from contact_guard import DuplicateFilter, message_fingerprint
+from email_queue import EmailQueue
+from page_cache import PageCache
+from password_hashing import HashingBusy, PasswordHasher
+from periodic_job import PeriodicJob
+from session_registry import SessionRevocations, sweep_expired_sessions
+from responsive_images import ResponsiveImages
+from static_assets import StaticAssets, build_assets
+from user_cache import UserCache
+from user_search import UserSearchIndex
 
 
 # --- Environment loading and config normalization helpers ---
-def load_dotenv_file(path=".env"):
-    """Load .env key/value pairs into process env when not already set."""
-    if not os.path.isabs(path):
-        local_path = os.path.join(os.path.dirname(__file__), path)
-        if os.path.exists(local_path):
-            path = local_path
-
-    if not os.path.exists(path):
-        return
-
-    with open(path, "r", encoding="utf-8") as env_file:
-        for raw_line in env_file:
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if key:
-                os.environ.setdefault(key, value)
-
-
-load_dotenv_file()
+# .env is loaded once here; reloadable values are read from runtime_settings.
+runtime_settings.store.load()
 
 
 def normalize_database_uri(uri):
@@ -92,20 +100,213 @@ raw_database_uri = os.getenv(
     f"sqlite:///{os.path.join(app.instance_path, 'portfolio.db')}",
 )
 app.config["SQLALCHEMY_DATABASE_URI"] = normalize_database_uri(raw_database_uri)
+DATABASE_BACKEND = make_url(app.config["SQLALCHEMY_DATABASE_URI"]).get_backend_name()
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+SQLITE_PROFILE, SQLITE_PRAGMAS = sqlite_profile.load_profile()
+if not sqlite_profile.is_sqlite_uri(app.config["SQLALCHEMY_DATABASE_URI"]):
+    SQLITE_PRAGMAS = {}
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = sqlite_profile.engine_options(
+    app.config["SQLALCHEMY_DATABASE_URI"], SQLITE_PRAGMAS
+)
 app.config["SESSION_COOKIE_HTTPONLY"] = True
 app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
 app.config["SESSION_COOKIE_SECURE"] = os.getenv("SESSION_COOKIE_SECURE", "0") == "1"
 app.config["PERMANENT_SESSION_LIFETIME"] = timedelta(hours=8)
 
-EMAIL_DELIVERY_MODE = os.getenv("EMAIL_DELIVERY_MODE", "mock").strip().lower()
-MAX_LOGIN_ATTEMPTS = int(os.getenv("LOGIN_MAX_ATTEMPTS", "5"))
-LOCKOUT_MINUTES = int(os.getenv("LOGIN_LOCKOUT_MINUTES", "15"))
+# Compiled templates survive restarts, so new workers skip Jinja compilation.
+JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR") or os.path.join(
+    app.instance_path, "jinja-cache"
+)
+if JINJA_BYTECODE_CACHE_DIR != "off":
+    os.makedirs(JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+    app.jinja_options = {
+        **app.jinja_options,
+        "bytecode_cache": FileSystemBytecodeCache(JINJA_BYTECODE_CACHE_DIR),
+    }
+
+# Startup-only settings. Login limits, delivery mode and SMTP settings live in
+# runtime_settings so they can change on reload.
+SETTINGS_WATCH_INTERVAL = float(os.getenv("SETTINGS_WATCH_INTERVAL", "5"))
+runtime_settings.store.watch_interval = SETTINGS_WATCH_INTERVAL
+EMAIL_QUEUE_WORKERS = int(os.getenv("EMAIL_QUEUE_WORKERS", "2"))
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("EMAIL_QUEUE_MAX_ATTEMPTS", "5"))
+EMAIL_QUEUE_BACKOFF_SECONDS = int(os.getenv("EMAIL_QUEUE_BACKOFF_SECONDS", "30"))
+EMAIL_QUEUE_POLL_SECONDS = float(os.getenv("EMAIL_QUEUE_POLL_SECONDS", "2"))
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt").strip()
+# Default to this process's share of the CPU: WEB_CONCURRENCY processes each
+# run their own pool.
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS")
+    or max(1, min(4, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY") or 1)))
+)
+PASSWORD_HASH_MAX_PENDING = int(
+    os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(1, PASSWORD_HASH_WORKERS) * 4))
+)
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "1") == "1"
+PAGE_CACHE_MAX_AGE = int(os.getenv("PAGE_CACHE_MAX_AGE", "60"))
+USER_ADMIN_PAGE_SIZE = int(os.getenv("USER_ADMIN_PAGE_SIZE", "50"))
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+AUDIT_RETENTION_BATCH_SIZE = int(os.getenv("AUDIT_RETENTION_BATCH_SIZE", "5000"))
+AUDIT_RETENTION_INTERVAL_HOURS = float(os.getenv("AUDIT_RETENTION_INTERVAL_HOURS", "0"))
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR") or os.path.join(
+    app.instance_path, "audit-archive"
+)
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+SESSION_SWEEP_INTERVAL_MINUTES = float(os.getenv("SESSION_SWEEP_INTERVAL_MINUTES", "15"))
+LOGIN_RATE_LIMIT_ENABLED = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").strip().lower()
+AUDIT_WRITE_MODE = os.getenv("AUDIT_WRITE_MODE", "sync").strip().lower()
+AUDIT_BUFFER_CAPACITY = int(os.getenv("AUDIT_BUFFER_CAPACITY", "10000"))
+AUDIT_FLUSH_SIZE = int(os.getenv("AUDIT_FLUSH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "1") == "1"
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "0") == "1"
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+SQL_PROFILER_MAX_STATEMENTS = int(os.getenv("SQL_PROFILER_MAX_STATEMENTS", "50"))
+CONTACT_RATE_LIMIT_ENABLED = os.getenv("CONTACT_RATE_LIMIT_ENABLED", "1") == "1"
+CONTACT_DUPLICATE_TTL = float(os.getenv("CONTACT_DUPLICATE_TTL", "3600"))
+CONTACT_DUPLICATE_CACHE_SIZE = int(os.getenv("CONTACT_DUPLICATE_CACHE_SIZE", "10000"))
+HEALTH_CHECK_TTL = float(os.getenv("HEALTH_CHECK_TTL", "5"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+HEALTH_SMTP_CHECK_TTL = float(os.getenv("HEALTH_SMTP_CHECK_TTL", "30"))
+HEALTH_MIN_FREE_MB = int(os.getenv("HEALTH_MIN_FREE_MB", "100"))
+HEALTH_MAX_QUEUE_BACKLOG = int(os.getenv("HEALTH_MAX_QUEUE_BACKLOG", "1000"))
 
 db = SQLAlchemy(app)
+with app.app_context():
+    sqlite_profile.install(db.engine, SQLITE_PRAGMAS)
 login_manager = LoginManager(app)
 login_manager.login_view = "login"
 login_manager.login_message = None
+static_assets = StaticAssets(app)
+# Immutable files: never read the session, so no "Vary: Cookie" on them.
+SESSIONLESS_ENDPOINTS = frozenset({"static", "hashed_static", "responsive_image"})
+
+
+class AssetSessionInterface(SecureCookieSessionInterface):
+    """Skip saving (and ``Vary: Cookie``) for static and asset responses.
+
+    Flask-Login reads the session in its own ``after_request`` hook, which
+    would otherwise mark every response as cookie-dependent.
+    """
+
+    def save_session(self, app, session, response):
+        if request.endpoint in SESSIONLESS_ENDPOINTS:
+            return
+        super().save_session(app, session, response)
+
+
+app.session_interface = AssetSessionInterface()
+responsive_images = ResponsiveImages(
+    app,
+    cache_dir=os.getenv("IMAGE_CACHE_DIR") or None,
+    static_url_for=static_assets.url_for,
+)
+page_cache = PageCache(enabled=PAGE_CACHE_ENABLED, max_age=PAGE_CACHE_MAX_AGE)
+user_search_index = UserSearchIndex()
+password_hasher = PasswordHasher(
+    PASSWORD_HASH_METHOD,
+    workers=PASSWORD_HASH_WORKERS,
+    max_pending=PASSWORD_HASH_MAX_PENDING,
+)
+
+
+# --- Metrics (per-thread counters, exposed at /metrics) ---
+metrics_registry = metrics.Registry()
+HTTP_REQUESTS = metrics_registry.counter(
+    "http_requests_total", "HTTP responses by route.", ("method", "route", "status")
+)
+HTTP_LATENCY = metrics_registry.histogram(
+    "http_request_duration_seconds", "Request handling time.", ("method", "route")
+)
+DB_QUERY_SECONDS = metrics_registry.histogram(
+    "db_query_duration_seconds", "Time per SQL statement."
+)
+DB_QUERIES_PER_REQUEST = metrics_registry.histogram(
+    "db_queries_per_request", "SQL statements per request.", ("route",),
+    buckets=metrics.COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = metrics_registry.histogram(
+    "db_time_per_request_seconds", "SQL time per request.", ("route",)
+)
+PASSWORD_HASH_SECONDS = metrics_registry.histogram(
+    "password_hash_duration_seconds", "Password hash/verify time.", ("operation",)
+)
+SMTP_SEND_SECONDS = metrics_registry.histogram(
+    "smtp_send_duration_seconds", "SMTP delivery time.", ("outcome",)
+)
+AUTH_EVENTS = metrics_registry.counter(
+    "auth_events_total", "Auth events by type and status.", ("event_type", "status")
+)
+CONTACT_SUPPRESSED = metrics_registry.counter(
+    "contact_suppressed_total", "Contact submissions answered without delivery.", ("reason",)
+)
+query_timer = metrics.QueryTimer(DB_QUERY_SECONDS)
+if METRICS_ENABLED:
+    with app.app_context():
+        query_timer.install(db.engine)
+
+
+def _metrics_route():
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+@app.before_request
+def start_request_metrics():
+    if METRICS_ENABLED:
+        g.metrics_started = time.perf_counter()
+        query_timer.begin()
+
+
+@app.after_request
+def note_response_status(response):
+    if "metrics_started" in g:
+        g.metrics_status = response.status_code
+    return response
+
+
+@app.teardown_request
+def record_request_metrics(exc):
+    # Teardown also runs when a view or hook raised and no response was
+    # finalized; such requests are counted as 500s.
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        route = _metrics_route()
+        status = 500 if exc is not None else g.pop("metrics_status", 500)
+        HTTP_LATENCY.observe(time.perf_counter() - started, request.method, route)
+        HTTP_REQUESTS.inc(request.method, route, str(status))
+        queries, seconds = query_timer.end()
+        DB_QUERIES_PER_REQUEST.observe(queries, route)
+        DB_TIME_PER_REQUEST.observe(seconds, route)
+
+
+# --- SQL profiler (opt-in) ---
+sql_profile = sql_profiler.SQLProfiler(
+    slow_ms=SQL_SLOW_QUERY_MS,
+    n_plus_one_threshold=SQL_N_PLUS_ONE_THRESHOLD,
+    max_statements=SQL_PROFILER_MAX_STATEMENTS,
+)
+if SQL_PROFILER_ENABLED:
+    with app.app_context():
+        sql_profile.install(db.engine)
+
+
+@app.before_request
+def start_sql_profile():
+    if SQL_PROFILER_ENABLED:
+        sql_profile.begin()
+
+
+@app.after_request
+def finish_sql_profile(response):
+    if SQL_PROFILER_ENABLED:
+        queries, seconds = sql_profile.end(f"{request.method} {_metrics_route()}")
+        response.headers["X-DB-Queries"] = str(queries)
+        response.headers["X-DB-Time"] = f"{seconds * 1000:.2f}"
+    return response
 
 
 # --- Database models ---
@@ -122,19 +323,30 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     def set_password(self, raw_password):
-        self.password_hash = generate_password_hash(raw_password)
+        with PASSWORD_HASH_SECONDS.time("hash"):
+            self.password_hash = password_hasher.hash(raw_password)
 
     def check_password(self, raw_password):
-        return check_password_hash(self.password_hash, raw_password)
+        with PASSWORD_HASH_SECONDS.time("verify"):
+            return password_hasher.verify(self.password_hash, raw_password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
 
     def is_locked(self):
         return self.lock_until is not None and self.lock_until > datetime.utcnow()
 
     def register_failed_login(self):
-        self.failed_login_attempts += 1
-        if self.failed_login_attempts >= MAX_LOGIN_ATTEMPTS:
+        # Incremented in SQL so failures counted by other workers are not lost;
+        # reading the attribute after the flush reloads the stored count.
+        self.failed_login_attempts = User.failed_login_attempts + 1
+        db.session.flush()
+        config = runtime_settings.current()
+        if self.failed_login_attempts >= config.login_max_attempts:
             self.failed_login_attempts = 0
-            self.lock_until = datetime.utcnow() + timedelta(minutes=LOCKOUT_MINUTES)
+            self.lock_until = datetime.utcnow() + timedelta(
+                minutes=config.login_lockout_minutes
+            )
 
     def reset_login_failures(self):
         self.failed_login_attempts = 0
@@ -145,8 +357,35 @@ class User(UserMixin, db.Model):
         return self.enabled
 
 
+# Per-process cache for load_user; changes to these fields reach every worker.
+user_cache = UserCache(
+    User,
+    ttl=USER_CACHE_TTL,
+    stamp_path=os.path.join(app.instance_path, "user-cache.stamp"),
+    shared_fields=("username", "password_hash", "enabled", "is_admin"),
+)
+user_cache.watch(db.session)
+
+
+def partial_index_where(condition):
+    # Only the configured dialect's option: naming postgresql_where loads the
+    # whole PostgreSQL dialect at import time, even on SQLite.
+    if DATABASE_BACKEND not in {"sqlite", "postgresql"}:
+        return {}
+    return {f"{DATABASE_BACKEND}_where": text(condition)}
+
+
 class UserSession(db.Model):
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        # Partial index: "active sessions" lookups never touch closed rows.
+        db.Index(
+            "ix_user_sessions_active_user_id_login_at",
+            "user_id",
+            "login_at",
+            **partial_index_where("status = 'active'"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
@@ -163,6 +402,12 @@ class UserSession(db.Model):
 
 class AuthEvent(db.Model):
     __tablename__ = "auth_events"
+    __table_args__ = (
+        db.Index("ix_auth_events_username_created_at", "username", "created_at"),
+        db.Index("ix_auth_events_ip_address_created_at", "ip_address", "created_at"),
+        db.Index("ix_auth_events_event_type_created_at", "event_type", "created_at"),
+        db.Index("ix_auth_events_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(
@@ -184,10 +429,222 @@ class AuthEvent(db.Model):
     )
 
 
+class AuthEventDaily(db.Model):
+    __tablename__ = "auth_event_daily"
+    __table_args__ = (
+        db.UniqueConstraint("day", "event_type", "status", "ip_address"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    event_type = db.Column(db.String(48), nullable=False)
+    status = db.Column(db.String(32), nullable=False)
+    ip_address = db.Column(db.String(64), nullable=False, default="")
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class EmailOutbox(db.Model):
+    __tablename__ = "email_outbox"
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    status = db.Column(db.String(16), nullable=False, default="pending", index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, index=True
+    )
+    locked_at = db.Column(db.DateTime, nullable=True)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.String(255), nullable=True)
+    first_name = db.Column(db.String(120), nullable=True)
+    last_name = db.Column(db.String(120), nullable=True)
+    sender_email = db.Column(db.String(255), nullable=True)
+    message = db.Column(db.Text, nullable=False)
+    ip_address = db.Column(db.String(64), nullable=True)
+
+
+# --- Buffered audit writes ---
+audit_buffer = AuditBuffer(
+    app,
+    db,
+    AuthEvent.__table__,
+    capacity=AUDIT_BUFFER_CAPACITY,
+    flush_size=AUDIT_FLUSH_SIZE,
+    flush_interval=AUDIT_FLUSH_INTERVAL,
+)
+
+
+# --- Contact email outbox ---
+def _deliver_outbox_message(message):
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        gt.send_email(
+            message.first_name or "",
+            message.last_name or "",
+            message.sender_email or "",
+            message.message,
+        )
+        outcome = "success"
+    finally:
+        SMTP_SEND_SECONDS.observe(time.perf_counter() - started, outcome)
+
+
+email_queue = EmailQueue(
+    app,
+    db,
+    EmailOutbox,
+    _deliver_outbox_message,
+    workers=EMAIL_QUEUE_WORKERS,
+    max_attempts=EMAIL_QUEUE_MAX_ATTEMPTS,
+    backoff_seconds=EMAIL_QUEUE_BACKOFF_SECONDS,
+    poll_seconds=EMAIL_QUEUE_POLL_SECONDS,
+)
+
+
+metrics_registry.gauge_callback(
+    "email_outbox_messages",
+    "Outbox messages by status.",
+    lambda: {(status,): count for status, count in email_queue.stats().items()},
+    ("status",),
+)
+metrics_registry.gauge_callback(
+    "audit_buffer_pending",
+    "Audit events waiting to be flushed.",
+    lambda: audit_buffer.stats()["pending"],
+)
+metrics_registry.counter_callback(
+    "password_hash_rejected_total",
+    "Hash requests refused because every slot was busy.",
+    lambda: password_hasher.rejected,
+)
+
+
+# --- Readiness checks ---
+def _outbox_backlog():
+    with app.app_context():
+        return EmailOutbox.query.filter_by(status="pending").count()
+
+
+def _smtp_address():
+    settings = gt.smtp_settings()
+    return settings["server"], settings["port"]
+
+
+def _smtp_mode_only(check):
+    # Registered up front: the delivery mode can change on a settings reload.
+    def run():
+        if runtime_settings.current().email_delivery_mode != "smtp":
+            return "skipped (mock delivery)"
+        return check()
+
+    return run
+
+
+readiness_checks = health_checks.HealthChecks(
+    ttl=HEALTH_CHECK_TTL, timeout=HEALTH_CHECK_TIMEOUT
+)
+with app.app_context():
+    readiness_checks.register(
+        "database",
+        health_checks.database_check(
+            db.engine, "SELECT 1 FROM users LIMIT 1", busy_timeout=HEALTH_CHECK_TIMEOUT / 2
+        ),
+    )
+readiness_checks.register(
+    "disk", health_checks.disk_check(app.instance_path, HEALTH_MIN_FREE_MB)
+)
+readiness_checks.register(
+    "smtp",
+    _smtp_mode_only(health_checks.tcp_check(_smtp_address, HEALTH_CHECK_TIMEOUT)),
+    ttl=HEALTH_SMTP_CHECK_TTL,
+)
+readiness_checks.register(
+    "email_queue",
+    _smtp_mode_only(
+        health_checks.backlog_check(_outbox_backlog, HEALTH_MAX_QUEUE_BACKLOG)
+    ),
+)
+
+
+# --- Audit retention ---
+def prune_audit_history(retention_days=None, batch_size=None, archive_dir=None):
+    return audit_retention.prune_audit_tables(
+        db,
+        AuthEvent,
+        UserSession,
+        AuthEventDaily,
+        retention_days=AUDIT_RETENTION_DAYS if retention_days is None else retention_days,
+        batch_size=batch_size or AUDIT_RETENTION_BATCH_SIZE,
+        archive_dir=AUDIT_ARCHIVE_DIR if archive_dir is None else archive_dir,
+    )
+
+
+retention_job = PeriodicJob(
+    app, prune_audit_history, AUDIT_RETENTION_INTERVAL_HOURS * 3600, "audit-retention"
+)
+
+
+# --- Session expiry and revocation ---
+def sweep_sessions():
+    return sweep_expired_sessions(
+        db.session, UserSession, app.config["PERMANENT_SESSION_LIFETIME"]
+    )
+
+
+session_sweep_job = PeriodicJob(
+    app, sweep_sessions, SESSION_SWEEP_INTERVAL_MINUTES * 60, "session-sweeper"
+)
+
+
+def _load_revoked_session_ids():
+    # Older revocations no longer matter: those cookies have expired anyway.
+    since = datetime.utcnow() - app.config["PERMANENT_SESSION_LIFETIME"]
+    rows = db.session.query(UserSession.id).filter(
+        UserSession.status == "revoked", UserSession.logout_at >= since
+    )
+    return {row.id for row in rows}
+
+
+session_revocations = SessionRevocations(
+    _load_revoked_session_ids,
+    os.path.join(app.instance_path, "session-revocations.stamp"),
+)
+
+
+_schema_lock = threading.Lock()
+_schema_checked = False
+
+
+@app.before_request
+def ensure_schema():
+    # Deferred from import time: processes that never serve a request skip it.
+    global _schema_checked
+    if _schema_checked or not DB_AUTO_MIGRATE:
+        return
+    with _schema_lock:
+        if not _schema_checked:
+            bootstrap_schema()
+            _schema_checked = True
+
+
+@app.before_request
+def reload_runtime_settings():
+    runtime_settings.store.maybe_reload()
+
+
+@app.before_request
+def start_background_workers():
+    if runtime_settings.current().email_delivery_mode == "smtp" and not email_queue.started:
+        email_queue.start()
+    retention_job.start()
+    session_sweep_job.start()
+
+
 # --- Login manager callbacks and request metadata helpers ---
 @login_manager.user_loader
 def load_user(user_id):
-    return db.session.get(User, int(user_id))
+    return user_cache.get(db.session, int(user_id))
 
 
 @login_manager.unauthorized_handler
@@ -195,6 +652,16 @@ def unauthorized():
     return redirect(url_for("login", next=request.path))
 
 
+@app.before_request
+def enforce_session_revocation():
+    if request.endpoint in SESSIONLESS_ENDPOINTS:
+        return
+    auth_session_id = session.get("auth_session_id")
+    if auth_session_id and session_revocations.is_revoked(int(auth_session_id)):
+        session.pop("auth_session_id", None)
+        logout_user()
+
+
 def _client_ip():
     forwarded_for = (request.headers.get("X-Forwarded-For") or "").split(",")[0].strip()
     return forwarded_for or request.remote_addr or ""
@@ -215,7 +682,7 @@ def add_auth_event(
     reason="",
     session_record_id=None,
 ):
-    event = AuthEvent(
+    values = dict(
         username=(username or getattr(user, "username", "") or "")[:120],
         user_id=getattr(user, "id", None),
         event_type=event_type[:48],
@@ -227,34 +694,89 @@ def add_auth_event(
         request_path=(request.path or "")[:255] or None,
         session_record_id=session_record_id,
     )
+    AUTH_EVENTS.inc(values["event_type"], values["status"])
+    if AUDIT_WRITE_MODE == "buffered":
+        # Written later in bulk; the caller's commit only covers user/session rows.
+        values["created_at"] = datetime.utcnow()
+        audit_buffer.append(values)
+        return None
+
+    event = AuthEvent(**values)
     db.session.add(event)
     return event
 
 
-# --- Database bootstrap and lightweight schema migration ---
-def ensure_schema_columns():
-    inspector = inspect(db.engine)
-    if "users" not in inspector.get_table_names():
-        return
+# --- Login throttling (checked before any DB lookup or hash check) ---
+rate_limit_backend = rate_limit.create_backend(RATE_LIMIT_BACKEND)
+login_ip_limiter = rate_limit.RateLimiter(
+    rate_limit_backend,
+    "login-ip",
+    burst=int(os.getenv("LOGIN_RATE_IP_BURST", "20")),
+    per_minute=float(os.getenv("LOGIN_RATE_IP_PER_MINUTE", "10")),
+)
+login_user_limiter = rate_limit.RateLimiter(
+    rate_limit_backend,
+    "login-user",
+    burst=int(os.getenv("LOGIN_RATE_USER_BURST", "10")),
+    per_minute=float(os.getenv("LOGIN_RATE_USER_PER_MINUTE", "2")),
+)
+
+
+def _login_throttled(username):
+    """Charge the IP and username buckets; return seconds to wait or 0."""
+    if not LOGIN_RATE_LIMIT_ENABLED:
+        return 0
+    allowed, retry_after = login_ip_limiter.hit(_client_ip() or "unknown")
+    if allowed and username:
+        allowed, retry_after = login_user_limiter.hit(username.lower())
+    return 0 if allowed else max(1, int(retry_after + 0.999))
 
-    rows = db.session.execute(text("PRAGMA table_info(users)")).all()
-    columns = {row[1] for row in rows}
-    if "is_admin" not in columns:
-        try:
-            with db.engine.begin() as conn:
-                conn.execute(
-                    text(
-                        "ALTER TABLE users ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT 0"
-                    )
-                )
-        except OperationalError as exc:
-            if "duplicate column name" not in str(exc).lower():
-                raise
+
+# --- Contact form abuse shield (checked before any delivery work) ---
+contact_ip_limiter = rate_limit.SlidingWindowLimiter(
+    rate_limit_backend,
+    "contact-ip",
+    limit=int(os.getenv("CONTACT_RATE_IP_LIMIT", "5")),
+    window_seconds=float(os.getenv("CONTACT_RATE_IP_WINDOW_SECONDS", "600")),
+)
+contact_email_limiter = rate_limit.SlidingWindowLimiter(
+    rate_limit_backend,
+    "contact-email",
+    limit=int(os.getenv("CONTACT_RATE_EMAIL_LIMIT", "3")),
+    window_seconds=float(os.getenv("CONTACT_RATE_EMAIL_WINDOW_SECONDS", "600")),
+)
+contact_duplicates = DuplicateFilter(
+    ttl=CONTACT_DUPLICATE_TTL, maxsize=CONTACT_DUPLICATE_CACHE_SIZE
+)
+
+
+def _contact_throttled(sender_email):
+    """Charge the IP and sender windows; return seconds to wait or 0."""
+    if not CONTACT_RATE_LIMIT_ENABLED:
+        return 0
+    allowed, retry_after = contact_ip_limiter.hit(_client_ip() or "unknown")
+    if allowed and sender_email:
+        allowed, retry_after = contact_email_limiter.hit(sender_email.lower())
+    return 0 if allowed else max(1, int(retry_after + 0.999))
+
+
+# --- Database bootstrap and lightweight schema migration ---
+def bootstrap_schema():
+    """Apply pending migrations; costs one version query when up to date."""
+    if schema_migrations.current_version(db.engine) >= schema_migrations.latest_version():
+        return []
+    return schema_migrations.upgrade(
+        db.engine,
+        {"metadata": db.metadata, "user_search_index": user_search_index},
+    )
 
 
 def initialize_database():
-    db.create_all()
-    ensure_schema_columns()
+    applied = bootstrap_schema()
+    print(
+        f"Schema at version {schema_migrations.current_version(db.engine)}"
+        + (f" (applied {', '.join(map(str, applied))})." if applied else ".")
+    )
 
     admin_username = os.getenv("ADMIN_USERNAME", "").strip()
     admin_password = os.getenv("ADMIN_PASSWORD", "")
@@ -288,9 +810,101 @@ def init_db_command():
     initialize_database()
 
 
-with app.app_context():
-    db.create_all()
-    ensure_schema_columns()
+@app.cli.command("schema-version")
+def schema_version_command():
+    current = schema_migrations.current_version(db.engine)
+    latest = schema_migrations.latest_version()
+    print(f"Schema version {current} of {latest}" + ("" if current >= latest else "; run init-db"))
+
+
+@app.cli.command("prune-audit")
+@click.option("--days", type=int, default=None, help="Keep rows newer than this.")
+@click.option("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+@click.option("--archive-dir", default=None, help="Where gzipped NDJSON archives go.")
+@click.option("--no-archive", is_flag=True, help="Delete without writing archives.")
+def prune_audit_command(days, batch_size, archive_dir, no_archive):
+    stats = prune_audit_history(
+        retention_days=days,
+        batch_size=batch_size,
+        archive_dir="" if no_archive else archive_dir,
+    )
+    print(f"Audit retention: {stats}")
+
+
+@app.cli.command("enable-incremental-vacuum")
+def enable_incremental_vacuum_command():
+    if audit_retention.enable_incremental_vacuum(db.engine):
+        print("Database rebuilt with auto_vacuum=INCREMENTAL.")
+    else:
+        print("Nothing to do: not SQLite, or auto_vacuum is already INCREMENTAL.")
+
+
+@app.cli.command("sweep-sessions")
+def sweep_sessions_command():
+    print(f"Marked {sweep_sessions()} stale session(s) as expired.")
+
+
+@app.cli.command("build-assets")
+def build_assets_command():
+    manifest = build_assets(app.static_folder, static_assets.output_dir)
+    static_assets.load_manifest()
+    print(f"Built {len(manifest)} fingerprinted asset(s) in {static_assets.output_dir}")
+
+
+@app.cli.command("build-images")
+def build_images_command():
+    generated, skipped = responsive_images.build()
+    print(
+        f"Responsive images: {generated} generated, {skipped} unchanged "
+        f"({responsive_images.cache_dir})"
+    )
+
+
+@app.cli.command("flush-audit")
+def flush_audit_command():
+    flushed = audit_buffer.flush()
+    print(f"Flushed {flushed} audit event(s). Buffer: {audit_buffer.stats()}")
+
+
+@app.cli.command("drain-email-queue")
+def drain_email_queue_command():
+    processed = email_queue.drain()
+    print(f"Processed {processed} queued email(s). Queue status: {email_queue.stats()}")
+
+
+@app.cli.command("import-users")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "json"]), default=None)
+def import_users_command(path, fmt):
+    with open(path, encoding="utf-8-sig") as handle:
+        report = import_users(handle.read(), _import_format(fmt, path))
+    print(f"Imported {report['created']} of {report['rows']} user(s).")
+    for error in report["errors"]:
+        print(f"  row {error['row']} ({error['username'] or '-'}): {error['error']}")
+
+
+@app.cli.command("export-users")
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option("--format", "fmt", type=click.Choice(["csv", "json"]), default=None)
+@click.option("--include-hashes", is_flag=True, help="Also export password hashes.")
+def export_users_command(path, fmt, include_hashes):
+    columns = list(user_bulk.EXPORT_COLUMNS)
+    if include_hashes:
+        columns.append("password_hash")
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        handle.writelines(
+            user_bulk.export_lines(iter_users(), _import_format(fmt, path), columns)
+        )
+    print(f"Exported users to {path}")
+
+
+# --- Error handlers ---
+@app.errorhandler(HashingBusy)
+def hashing_busy(_exc):
+    response = jsonify({"ok": False, "error": "Server busy, please retry."})
+    response.status_code = 429
+    response.headers["Retry-After"] = "1"
+    return response
 
 
 # --- Access-control decorators ---
@@ -307,21 +921,25 @@ def admin_required(view_func):
 
 # --- Public pages ---
 @app.route("/")
+@page_cache.cached("index.html")
 def home():
     return rt("index.html")
 
 
 @app.route("/contact")
+@page_cache.cached("contact.html")
 def contact():
     return rt("contact.html")
 
 
 @app.route("/projects")
+@page_cache.cached("projects.html")
 def projects():
     return rt("projects.html")
 
 
 @app.route("/tools")
+@page_cache.cached("tools.html")
 def tools():
     return rt("tools.html")
 
@@ -333,18 +951,35 @@ def more_tools():
 
 
 # --- User administration routes (admin-only) ---
+def _users_page(query_text, after, limit):
+    """Return one username-ordered page of users and the cursor for the next."""
+    users_query = User.query
+    if query_text:
+        if user_search_index.available is None:
+            user_search_index.detect(db.engine)
+        if user_search_index.can_search(query_text):
+            users_query = users_query.filter(
+                User.id.in_(user_search_index.match_ids(query_text))
+            )
+        else:
+            users_query = users_query.filter(User.username.ilike(f"%{query_text}%"))
+    if after:
+        users_query = users_query.filter(User.username > after)
+
+    users = users_query.order_by(User.username.asc()).limit(limit + 1).all()
+    next_cursor = users[limit - 1].username if len(users) > limit else None
+    return users[:limit], next_cursor
+
+
 @app.route("/user-admin")
 @admin_required
 def user_admin():
     query_text = (request.args.get("q") or "").strip()
+    after = request.args.get("after", "")
     error = request.args.get("error", "")
     success = request.args.get("success", "")
 
-    users_query = User.query
-    if query_text:
-        users_query = users_query.filter(User.username.ilike(f"%{query_text}%"))
-
-    users = users_query.order_by(User.username.asc()).all()
+    users, next_cursor = _users_page(query_text, after, USER_ADMIN_PAGE_SIZE)
     recent_auth_events = (
         AuthEvent.query.order_by(AuthEvent.created_at.desc()).limit(20).all()
     )
@@ -355,11 +990,192 @@ def user_admin():
         "user_admin.html",
         users=users,
         q=query_text,
+        after=after,
+        next_cursor=next_cursor,
         error=error,
         success=success,
         recent_auth_events=recent_auth_events,
         recent_sessions=recent_sessions,
+        sql_profile=sql_profile.top(10) if SQL_PROFILER_ENABLED else None,
+    )
+
+
+@app.route("/user-admin/users.json")
+@admin_required
+def user_admin_users_json():
+    query_text = (request.args.get("q") or "").strip()
+    after = request.args.get("after", "")
+    try:
+        limit = int(request.args.get("limit", USER_ADMIN_PAGE_SIZE))
+    except ValueError:
+        limit = USER_ADMIN_PAGE_SIZE
+    limit = max(1, min(limit, 200))
+
+    users, next_cursor = _users_page(query_text, after, limit)
+    return jsonify(
+        {
+            "users": [
+                {
+                    "id": user.id,
+                    "username": user.username,
+                    "enabled": user.enabled,
+                    "is_admin": user.is_admin,
+                    "locked": user.is_locked(),
+                    "created_at": user.created_at.isoformat(),
+                }
+                for user in users
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+AUTH_EVENT_EXPORT_COLUMNS = [column.name for column in AuthEvent.__table__.columns]
+
+
+@app.route("/user-admin/api/auth-events")
+@admin_required
+def user_admin_auth_events():
+    try:
+        limit = max(1, min(int(request.args.get("limit", 100)), 1000))
+        conditions = audit_query.auth_event_filters(AuthEvent, request.args)
+        events, next_cursor = audit_query.page(
+            AuthEvent.query,
+            AuthEvent,
+            conditions,
+            cursor=request.args.get("cursor"),
+            limit=limit,
+        )
+    except (audit_query.AuditQueryError, ValueError) as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+
+    return jsonify(
+        {
+            "events": [
+                audit_query.row_to_dict(event, AUTH_EVENT_EXPORT_COLUMNS)
+                for event in events
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@app.route("/user-admin/api/auth-events/export")
+@admin_required
+def user_admin_auth_events_export():
+    export_format = (request.args.get("format") or "ndjson").lower()
+    if export_format not in {"ndjson", "csv"}:
+        return jsonify({"ok": False, "error": "format must be ndjson or csv"}), 400
+    try:
+        conditions = audit_query.auth_event_filters(AuthEvent, request.args)
+    except audit_query.AuditQueryError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+
+    rows = audit_query.iter_all(AuthEvent.query, AuthEvent, conditions)
+    if export_format == "csv":
+        body = audit_query.csv_lines(rows, AUTH_EVENT_EXPORT_COLUMNS)
+        mimetype = "text/csv"
+    else:
+        body = audit_query.ndjson_lines(rows, AUTH_EVENT_EXPORT_COLUMNS)
+        mimetype = "application/x-ndjson"
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=auth_events.{export_format}"
+    )
+    return response
+
+
+def _session_to_dict(record):
+    return audit_query.row_to_dict(
+        record, [column.name for column in UserSession.__table__.columns]
+    )
+
+
+def _revoke_sessions(records, reason):
+    now = datetime.utcnow()
+    for record in records:
+        record.status = "revoked"
+        record.logout_at = now
+        add_auth_event(
+            event_type="session_revoke",
+            status="success",
+            success=True,
+            username=record.username,
+            reason=reason,
+            session_record_id=record.id,
+        )
+    db.session.commit()
+    if records:
+        session_revocations.mark_changed()
+    return len(records)
+
+
+def _active_sessions_query(user_id=None):
+    since = datetime.utcnow() - app.config["PERMANENT_SESSION_LIFETIME"]
+    query = UserSession.query.filter(
+        UserSession.status == "active", UserSession.login_at >= since
     )
+    if user_id is not None:
+        query = query.filter(UserSession.user_id == user_id)
+    return query
+
+
+@app.route("/user-admin/api/sessions")
+@admin_required
+def user_admin_sessions():
+    user_id = request.args.get("user_id", type=int)
+    records = (
+        _active_sessions_query(user_id)
+        .order_by(UserSession.login_at.desc())
+        .limit(500)
+        .all()
+    )
+    return jsonify({"sessions": [_session_to_dict(record) for record in records]})
+
+
+@app.route("/user-admin/api/sql-profile")
+@admin_required
+def user_admin_sql_profile():
+    if not SQL_PROFILER_ENABLED:
+        return jsonify({"ok": False, "error": "SQL profiler is disabled."}), 404
+    order = request.args.get("order", "total")
+    if order not in {"total", "max", "count"}:
+        return jsonify({"ok": False, "error": "order must be total, max or count."}), 400
+    limit = max(1, min(request.args.get("limit", 20, type=int), 200))
+    return jsonify(
+        {
+            "ok": True,
+            "slow_query_ms": SQL_SLOW_QUERY_MS,
+            "n_plus_one_threshold": SQL_N_PLUS_ONE_THRESHOLD,
+            **sql_profile.top(limit, order),
+        }
+    )
+
+
+@app.route("/user-admin/api/sql-profile/reset", methods=["POST"])
+@admin_required
+def user_admin_sql_profile_reset():
+    sql_profile.reset()
+    return jsonify({"ok": True})
+
+
+@app.route("/user-admin/api/sessions/<int:session_id>/revoke", methods=["POST"])
+@admin_required
+def user_admin_revoke_session(session_id):
+    record = db.session.get(UserSession, session_id)
+    if not record or record.status != "active":
+        return jsonify({"ok": False, "error": "Active session not found."}), 404
+    _revoke_sessions([record], f"revoked_by:{current_user.username}")
+    return jsonify({"ok": True, "revoked": 1})
+
+
+@app.route("/user-admin/api/users/<int:user_id>/sessions/revoke", methods=["POST"])
+@admin_required
+def user_admin_revoke_user_sessions(user_id):
+    records = _active_sessions_query(user_id).all()
+    revoked = _revoke_sessions(records, f"revoked_by:{current_user.username}")
+    return jsonify({"ok": True, "revoked": revoked})
 
 
 @app.route("/user-admin/create", methods=["POST"])
@@ -474,6 +1290,160 @@ def user_admin_delete(user_id):
     return redirect(url_for("user_admin", success="User deleted."))
 
 
+# --- Bulk user import/export and bulk actions ---
+BULK_ACTIONS = {"enable", "disable", "delete"}
+
+
+def _import_format(fmt, filename):
+    fmt = (fmt or os.path.splitext(filename or "")[1].lstrip(".")).lower()
+    if fmt not in {"csv", "json"}:
+        raise ValueError("format must be csv or json")
+    return fmt
+
+
+def import_users(payload, fmt):
+    """Validate and insert users from CSV/JSON text; returns a per-row report."""
+    rows = user_bulk.parse_users(payload, fmt)
+    existing = set(db.session.scalars(db.select(User.username)))
+    valid, errors = user_bulk.validate_users(rows, existing)
+    created, conflicts = user_bulk.insert_users(
+        db.session, User.__table__, valid, password_hasher.hash_many
+    )
+    errors = sorted(errors + conflicts, key=lambda error: error["row"])
+    return {"rows": len(rows), "created": created, "errors": errors}
+
+
+def iter_users(batch_size=1000):
+    """Yield every user in id order, one keyset batch at a time."""
+    last_id = 0
+    while True:
+        batch = (
+            User.query.filter(User.id > last_id)
+            .order_by(User.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return
+        yield from batch
+        last_id = batch[-1].id
+        db.session.expunge_all()
+
+
+def _bulk_response(ok, message, status=200, **extra):
+    if request.is_json:
+        key = "message" if ok else "error"
+        return jsonify({"ok": ok, key: message, **extra}), status
+    return redirect(url_for("user_admin", **{"success" if ok else "error": message}))
+
+
+def _import_summary(report, limit=10):
+    """One-line summary of an import for the admin page banner."""
+    summary = f"Imported {report['created']} of {report['rows']} user(s)."
+    errors = report["errors"]
+    if errors:
+        listed = "; ".join(
+            f"row {error['row']} ({error['username'] or '-'}): {error['error']}"
+            for error in errors[:limit]
+        )
+        more = f"; {len(errors) - limit} more" if len(errors) > limit else ""
+        summary += f" {len(errors)} row(s) skipped: {listed}{more}."
+    return summary
+
+
+@app.route("/user-admin/import", methods=["POST"])
+@admin_required
+def user_admin_import():
+    # The admin page posts a plain form; API clients get JSON.
+    from_browser = request.accept_mimetypes.best == "text/html"
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        if from_browser:
+            return redirect(url_for("user_admin", error="Upload a CSV or JSON file."))
+        return jsonify({"ok": False, "error": "Upload a CSV or JSON file."}), 400
+    try:
+        fmt = _import_format(request.form.get("format"), upload.filename)
+        report = import_users(upload.read().decode("utf-8-sig"), fmt)
+    except (ValueError, UnicodeDecodeError) as exc:
+        if from_browser:
+            return redirect(url_for("user_admin", error=str(exc)))
+        return jsonify({"ok": False, "error": str(exc)}), 400
+
+    add_auth_event(
+        event_type="user_import",
+        status="success",
+        success=True,
+        username=current_user.username,
+        reason=f"created:{report['created']} errors:{len(report['errors'])}",
+    )
+    db.session.commit()
+    if from_browser:
+        key = "error" if report["errors"] else "success"
+        return redirect(url_for("user_admin", **{key: _import_summary(report)}))
+    return jsonify({"ok": True, **report})
+
+
+@app.route("/user-admin/export")
+@admin_required
+def user_admin_export():
+    export_format = (request.args.get("format") or "csv").lower()
+    if export_format not in {"csv", "json"}:
+        return jsonify({"ok": False, "error": "format must be csv or json"}), 400
+
+    body = user_bulk.export_lines(iter_users(), export_format)
+    mimetype = "text/csv" if export_format == "csv" else "application/json"
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=users.{export_format}"
+    )
+    return response
+
+
+@app.route("/user-admin/bulk", methods=["POST"])
+@admin_required
+def user_admin_bulk():
+    if request.is_json:
+        payload = request.get_json(silent=True) or {}
+        raw_ids = payload.get("user_ids") or []
+    else:
+        payload = request.form
+        raw_ids = request.form.getlist("user_ids")
+    action = (payload.get("action") or "").strip()
+    try:
+        user_ids = {int(user_id) for user_id in raw_ids}
+    except (TypeError, ValueError):
+        return _bulk_response(False, "user_ids must be integers.", 400)
+
+    if action not in BULK_ACTIONS:
+        return _bulk_response(False, "Choose enable, disable or delete.", 400)
+    if not user_ids:
+        return _bulk_response(False, "Select at least one user.", 400)
+    if current_user.id in user_ids and action != "enable":
+        return _bulk_response(False, f"You cannot {action} your own account.", 400)
+
+    targets = db.session.execute(
+        db.select(User.id, User.username).where(User.id.in_(user_ids))
+    ).all()
+    ids = [row.id for row in targets]
+    if action == "delete":
+        statement = delete(User).where(User.id.in_(ids))
+    else:
+        statement = update(User).where(User.id.in_(ids)).values(enabled=action == "enable")
+    db.session.execute(statement.execution_options(synchronize_session=False))
+    for row in targets:
+        add_auth_event(
+            event_type=f"user_bulk_{action}",
+            status="success",
+            success=True,
+            username=row.username,
+            reason=f"{action}d_by:{current_user.username}",
+        )
+    db.session.commit()
+    # Core UPDATE/DELETE skips the ORM hooks user_cache listens to.
+    user_cache.invalidate(*ids)
+    return _bulk_response(True, f"{len(ids)} user(s) {action}d.", affected=len(ids))
+
+
 # --- Authentication routes ---
 def _safe_next_url(next_url):
     return bool(next_url) and next_url.startswith("/") and not next_url.startswith("//")
@@ -492,7 +1462,22 @@ def login():
         password = request.form.get("password") or ""
         next_url = request.form.get("next", "")
 
-        user = User.query.filter_by(username=username).first() if username else None
+        retry_after = _login_throttled(username)
+        if retry_after:
+            error = "Too many login attempts. Please try again later."
+            response = app.make_response(
+                (rt("login.html", error=error, next_url=next_url), 429)
+            )
+            response.headers["Retry-After"] = str(retry_after)
+            return response
+
+        # populate_existing: lockout fields always come from the database, never
+        # from a row user_cache merged into this session.
+        user = (
+            User.query.filter_by(username=username).populate_existing().first()
+            if username
+            else None
+        )
 
         if user and user.is_locked():
             add_auth_event(
@@ -507,7 +1492,17 @@ def login():
             error = "Account temporarily locked. Please try again later."
             return rt("login.html", error=error, next_url=next_url), 429
 
-        if not user or not user.enabled or not user.check_password(password):
+        try:
+            password_ok = bool(user) and user.enabled and user.check_password(password)
+        except HashingBusy:
+            error = "Server busy. Please try again in a moment."
+            response = app.make_response(
+                (rt("login.html", error=error, next_url=next_url), 429)
+            )
+            response.headers["Retry-After"] = "1"
+            return response
+
+        if not password_ok:
             reason = (
                 "disabled_account"
                 if (user and not user.enabled)
@@ -528,6 +1523,12 @@ def login():
             return rt("login.html", error=error, next_url=next_url), 401
 
         user.reset_login_failures()
+        if user.password_needs_rehash():
+            # Upgrade hashes made with older cost settings while we have the password.
+            try:
+                user.set_password(password)
+            except HashingBusy:
+                pass
         login_user(user)
         session.permanent = True
         new_session = UserSession(
@@ -592,12 +1593,48 @@ def health():
     return jsonify(
         {
             "status": "ok",
-            "email_delivery_mode": EMAIL_DELIVERY_MODE,
+            "email_delivery_mode": runtime_settings.current().email_delivery_mode,
             "authenticated": bool(current_user.is_authenticated),
+            "audit_write_mode": AUDIT_WRITE_MODE,
+            "audit_buffer": (
+                audit_buffer.stats() if AUDIT_WRITE_MODE == "buffered" else None
+            ),
+            "contact_suppressed": {
+                "rate_limited_ip": contact_ip_limiter.rejected,
+                "rate_limited_email": contact_email_limiter.rejected,
+                "duplicates": contact_duplicates.duplicates,
+            },
+            "settings": runtime_settings.store.stats(),
         }
     )
 
 
+@app.route("/health/live")
+def health_live():
+    # Liveness only proves the process answers; dependencies belong to readiness.
+    return jsonify({"status": "ok"})
+
+
+@app.route("/health/ready")
+def health_ready():
+    ready, checks = readiness_checks.run()
+    return (
+        jsonify({"status": "ok" if ready else "unavailable", "checks": checks}),
+        200 if ready else 503,
+    )
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    if not METRICS_ENABLED:
+        abort(404)
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        abort(401)
+    return Response(
+        metrics_registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 def _extract_contact_payload():
     if request.is_json:
         data = request.get_json(silent=True) or {}
@@ -622,30 +1659,79 @@ def send_email():
 
         # Honeypot anti-bot: silently accept
         if honeypot:
+            CONTACT_SUPPRESSED.inc("honeypot")
             return jsonify({"ok": True}), 200
 
         if not the_email or len(the_email) < 10:
             return jsonify({"ok": False, "error": "Message too short"}), 400
 
+        retry_after = _contact_throttled(t_email)
+        if retry_after:
+            CONTACT_SUPPRESSED.inc("rate_limited")
+            response = jsonify({"ok": False, "error": "Too many messages, try later."})
+            response.status_code = 429
+            response.headers["Retry-After"] = str(retry_after)
+            return response
+
+        # A repeat of a recent message is acknowledged without sending it again.
+        fingerprint = message_fingerprint(the_email, t_email)
+        if contact_duplicates.is_duplicate(fingerprint):
+            CONTACT_SUPPRESSED.inc("duplicate")
+            return jsonify({"ok": True}), 200
+
         try:
-            if EMAIL_DELIVERY_MODE == "smtp":
-                gt.send_email(f_name, l_name, t_email, the_email)
-            else:
-                app.logger.info("Mock email: from=%s message=%s", t_email, the_email)
+            if runtime_settings.current().email_delivery_mode == "smtp":
+                # Hand off to the outbox; background workers do the SMTP round-trip.
+                email_queue.enqueue(
+                    first_name=f_name[:120],
+                    last_name=l_name[:120],
+                    sender_email=t_email[:255],
+                    message=the_email,
+                    ip_address=_client_ip()[:64] or None,
+                )
+                db.session.commit()
+                contact_duplicates.remember(fingerprint)
+                email_queue.notify()
+                return jsonify({"ok": True, "queued": True}), 202
+            app.logger.info("Mock email: from=%s message=%s", t_email, the_email)
+            contact_duplicates.remember(fingerprint)
             return jsonify({"ok": True}), 200
-        except ValueError as exc:
-            return jsonify({"ok": False, "error": str(exc)}), 500
         except Exception:
-            app.logger.exception("Email send failure")
+            db.session.rollback()
+            app.logger.exception("Email enqueue failure")
             return jsonify({"ok": False, "error": "Send failure"}), 500
     except Exception:
         return jsonify({"ok": False, "error": "Invalid request"}), 400
 
 
+# --- Application factory and process lifecycle ---
+def create_app(bootstrap=False):
+    """Return the configured app; with ``bootstrap`` also create missing schema."""
+    if bootstrap:
+        with app.app_context():
+            bootstrap_schema()
+    return app
+
+
+def shutdown_background_workers(timeout=10.0):
+    """Finish in-flight work before the process exits.
+
+    Outbox rows are durable, so stopping the queue only waits for messages
+    already being sent; buffered audit events are flushed to the database.
+    """
+    retention_job.stop(timeout)
+    session_sweep_job.stop(timeout)
+    email_queue.stop(timeout)
+    audit_buffer.stop(timeout)
+    password_hasher.shutdown()
+
+
 # --- Local entrypoint / CLI compatibility ---
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "init-db":
         with app.app_context():
             initialize_database()
     else:
-        app.run(debug=os.getenv("FLASK_DEBUG", "1") == "1")
+        # Development server only; use gunicorn with gunicorn.conf.py in production.
+        runtime_settings.store.install_signal_handler()
+        app.run(debug=os.getenv("FLASK_DEBUG", "0") == "1")
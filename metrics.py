@@ -0,0 +1,221 @@
+"""Low-overhead counters and histograms rendered in Prometheus text format."""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """Metrics whose samples live in per-thread shards.
+
+    Each thread only writes to its own dict, so recording needs no lock; the
+    shards are summed when ``/metrics`` is scraped. Shards of finished threads
+    are folded into a base shard, so short-lived threads do not pile up.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._callbacks = []
+        self._shards = []  # [(thread, shard)]
+        self._base = {}
+        self._shards_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._prune_locked()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _prune_locked(self):
+        """Fold shards of threads that have exited into ``_base``."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for metric in self._metrics:
+                values = shard.get(metric.name)
+                if not values:
+                    continue
+                base = self._base.setdefault(metric.name, {})
+                for key, value in values.items():
+                    base[key] = metric.merge(base.get(key), value)
+        self._shards = live
+
+    def counter(self, name, help_text, labels=()):
+        metric = Counter(self, name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(self, name, help_text, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge_callback(self, name, help_text, func, labels=()):
+        """Register a gauge read at scrape time.
+
+        ``func`` returns a number, or a dict of label-value tuples to numbers.
+        """
+        self._callbacks.append((name, help_text, tuple(labels), func, "gauge"))
+
+    def counter_callback(self, name, help_text, func, labels=()):
+        """Like ``gauge_callback`` for a total that only ever grows."""
+        self._callbacks.append((name, help_text, tuple(labels), func, "counter"))
+
+    def _merged(self, metric):
+        with self._shards_lock:
+            self._prune_locked()
+            merged = {
+                key: metric.merge(None, value)
+                for key, value in self._base.get(metric.name, {}).items()
+            }
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for key, value in list(shard.get(metric.name, {}).items()):
+                merged[key] = metric.merge(merged.get(key), value)
+        return merged
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, value in sorted(self._merged(metric).items()):
+                lines.extend(metric.samples(key, value))
+        for name, help_text, labels, func, kind in self._callbacks:
+            try:
+                value = func()
+            except Exception:  # A broken gauge must not break the scrape.
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            items = value.items() if isinstance(value, dict) else [((), value)]
+            for key, sample in sorted(items):
+                key = key if isinstance(key, tuple) else (key,)
+                lines.append(f"{name}{_format_labels(labels, key)} {_format_number(sample)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, registry, name, help_text, labels):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+
+    def inc(self, *label_values, amount=1):
+        values = self.registry._shard().setdefault(self.name, {})
+        values[label_values] = values.get(label_values, 0) + amount
+
+    @staticmethod
+    def merge(total, value):
+        return value if total is None else total + value
+
+    def samples(self, key, value):
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}"]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labels, buckets):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *label_values):
+        values = self.registry._shard().setdefault(self.name, {})
+        state = values.get(label_values)
+        if state is None:
+            # [per-bucket counts (last one is +Inf), sum]
+            state = values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    @staticmethod
+    def merge(total, value):
+        if total is None:
+            return [list(value[0]), value[1]]
+        return [[a + b for a, b in zip(total[0], value[0])], total[1] + value[1]]
+
+    def samples(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(self.labels, key, [("le", _format_number(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labels, key)
+        lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class QueryTimer:
+    """Count statements and time spent on an engine, overall and per request."""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self._local = threading.local()
+
+    def install(self, engine):
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["query_started"].pop()
+            self.histogram.observe(elapsed)
+            totals = getattr(self._local, "totals", None)
+            if totals is not None:
+                totals[0] += 1
+                totals[1] += elapsed
+
+    def begin(self):
+        self._local.totals = [0, 0.0]
+
+    def end(self):
+        """Return ``(queries, seconds)`` since ``begin`` on this thread."""
+        totals = getattr(self._local, "totals", None)
+        self._local.totals = None
+        return tuple(totals) if totals else (0, 0.0)
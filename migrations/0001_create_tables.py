@@ -0,0 +1,7 @@
+"""Create every model table that does not exist yet."""
+
+
+def upgrade(engine, context):
+    # Tables come from the current models; later migrations that add columns
+    # must therefore tolerate the column already being there.
+    context["metadata"].create_all(engine, checkfirst=True)
@@ -0,0 +1,6 @@
+"""Add ``users.is_admin`` to databases created before admin roles existed."""
+from schema_migrations import add_column
+
+
+def upgrade(engine, context):
+    add_column(engine, "users", "is_admin", "BOOLEAN NOT NULL DEFAULT FALSE")
@@ -0,0 +1,19 @@
+"""Composite audit indexes and the partial active-session index."""
+from schema_migrations import create_index_online
+
+INDEXES = (
+    ("auth_events", "ix_auth_events_username_created_at"),
+    ("auth_events", "ix_auth_events_ip_address_created_at"),
+    ("auth_events", "ix_auth_events_event_type_created_at"),
+    ("auth_events", "ix_auth_events_user_id_created_at"),
+    ("user_sessions", "ix_user_sessions_active_user_id_login_at"),
+)
+
+
+def upgrade(engine, context):
+    tables = context["metadata"].tables
+    for table_name, index_name in INDEXES:
+        index = next(
+            index for index in tables[table_name].indexes if index.name == index_name
+        )
+        create_index_online(engine, index)
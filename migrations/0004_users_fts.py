@@ -0,0 +1,5 @@
+"""Trigram FTS5 index over usernames (SQLite only; skipped elsewhere)."""
+
+
+def upgrade(engine, context):
+    context["user_search_index"].ensure(engine)
@@ -0,0 +1,93 @@
+"""Rendered-page cache with strong ETags for anonymous GETs of static pages."""
+import hashlib
+import os
+import threading
+from functools import wraps
+
+from flask import current_app, make_response, request
+from flask_login import current_user
+
+
+class PageCache:
+    """Cache the HTML of template-only views, keyed by endpoint and template mtime.
+
+    Only anonymous ``GET``/``HEAD`` requests are served from the cache, since
+    the templates personalise the header for signed-in users. Every cached
+    response carries a strong ETag so repeat visitors get ``304 Not Modified``.
+    """
+
+    def __init__(self, *, enabled=True, max_age=60):
+        self.enabled = enabled
+        self.max_age = max_age
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _template_mtime(self, template_name):
+        app = current_app
+        path = os.path.join(app.root_path, app.template_folder, template_name)
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _lookup(self, endpoint, mtime):
+        with self._lock:
+            entry = self._entries.get(endpoint)
+        if entry is None:
+            return None
+        if entry[0] != mtime:
+            # The template changed on disk: drop Jinja's compiled copy too.
+            current_app.jinja_env.cache.clear()
+            with self._lock:
+                self._entries.pop(endpoint, None)
+            return None
+        return entry
+
+    def cached(self, template_name):
+        """Decorate a view that only renders ``template_name``."""
+
+        def decorator(view_func):
+            @wraps(view_func)
+            def wrapped(*args, **kwargs):
+                if (
+                    not self.enabled
+                    or request.method not in ("GET", "HEAD")
+                    or current_user.is_authenticated
+                ):
+                    return view_func(*args, **kwargs)
+
+                mtime = self._template_mtime(template_name)
+                entry = self._lookup(request.endpoint, mtime)
+                if entry is None:
+                    self.misses += 1
+                    body = make_response(view_func(*args, **kwargs)).get_data()
+                    etag = hashlib.sha256(body).hexdigest()[:32]
+                    entry = (mtime, body, etag)
+                    with self._lock:
+                        self._entries[request.endpoint] = entry
+                else:
+                    self.hits += 1
+
+                response = make_response(entry[1])
+                response.mimetype = "text/html"
+                response.set_etag(entry[2])
+                response.headers["Cache-Control"] = (
+                    f"public, max-age={self.max_age}, must-revalidate"
+                )
+                response.vary.add("Cookie")
+                return response.make_conditional(request)
+
+            return wrapped
+
+        return decorator
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {"entries": size, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,110 @@
+"""Bounded, off-thread password hashing with configurable cost."""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+
+class HashingBusy(RuntimeError):
+    """Raised when every hashing slot is taken; callers should answer 429."""
+
+
+def canonical_method(method):
+    """Expand a werkzeug method name to the full prefix stored in hashes."""
+    parts = method.split(":")
+    if parts[0] == "scrypt":
+        defaults = ["scrypt", "32768", "8", "1"]
+    elif parts[0] == "pbkdf2":
+        defaults = ["pbkdf2", "sha256", str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        return method
+    return ":".join(parts + defaults[len(parts):])
+
+
+class PasswordHasher:
+    """Run werkzeug hashing in a process pool behind a non-blocking semaphore.
+
+    At most ``max_pending`` hash operations may be queued or running; beyond
+    that ``HashingBusy`` is raised right away instead of piling up requests.
+    With ``workers=0`` hashing runs on the calling thread, still bounded.
+    """
+
+    def __init__(self, method="scrypt", *, workers=2, max_pending=8, wait_seconds=0.05):
+        self.method = canonical_method(method)
+        self.workers = max(0, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.wait_seconds = wait_seconds
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.wait_seconds):
+            self.rejected += 1
+            raise HashingBusy("Password hashing capacity exhausted")
+        try:
+            if self.workers == 0:
+                return func(*args)
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords):
+        """Hash a batch on the shared pool, a few passwords at a time.
+
+        Each hash in flight holds a slot. The batch waits for slots instead of
+        raising ``HashingBusy`` and holds at most ``workers`` of them (one with
+        ``max_pending`` to spare), so logins keep the rest.
+        """
+        if self.workers == 0:
+            hashes = []
+            for password in passwords:
+                with self._slots:
+                    hashes.append(generate_password_hash(password, self.method))
+            return hashes
+        limit = max(1, min(self.workers, self.max_pending - 1))
+        executor = self._get_executor()
+        futures = []
+        for password in passwords:
+            if len(futures) >= limit:
+                futures[-limit].exception()  # wait for the oldest hash in the window
+            self._slots.acquire()
+            try:
+                future = executor.submit(generate_password_hash, password, self.method)
+            except BaseException:
+                self._slots.release()
+                raise
+            future.add_done_callback(self._release_slot)
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def _release_slot(self, future):
+        self._slots.release()
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when ``password_hash`` was made with other parameters."""
+        stored_method = (password_hash or "").split("$", 1)[0]
+        return canonical_method(stored_method) != self.method
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
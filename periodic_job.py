@@ -0,0 +1,47 @@
+"""Run a callable on a fixed interval from a daemon thread."""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Call ``job`` inside an app context every ``interval_seconds``.
+
+    A non-positive interval disables the job, so callers can start it
+    unconditionally and let configuration decide.
+    """
+
+    def __init__(self, app, job, interval_seconds, name):
+        self.app = app
+        self.job = job
+        self.interval_seconds = float(interval_seconds)
+        self.name = name
+        self._stopping = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None or self.interval_seconds <= 0:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping.wait(self.interval_seconds):
+            try:
+                with self.app.app_context():
+                    result = self.job()
+                logger.info("%s run: %s", self.name, result)
+            except Exception:
+                logger.exception("%s run failed", self.name)
+
+    def stop(self, timeout=None):
+        """Stop scheduling and wait up to ``timeout`` seconds for a running job."""
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
@@ -0,0 +1,132 @@
+"""Token-bucket and sliding-window rate limiting with swappable storage backends."""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class InMemoryBackend:
+    """Per-process bucket store, evicting least-recently-used keys when full.
+
+    Backends only need ``take(key, capacity, refill_rate, cost)`` and
+    ``count(key, limit, window, cost)``, both returning
+    ``(allowed, retry_after_seconds)``, so a shared store (Redis, memcached)
+    can implement the same methods and be dropped in.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max(1, int(max_keys))
+        self._buckets = OrderedDict()
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= cost:
+                allowed, retry_after = True, 0.0
+                tokens -= cost
+            else:
+                allowed = False
+                retry_after = (cost - tokens) / refill_rate if refill_rate else float("inf")
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def count(self, key, limit, window, cost=1):
+        """Sliding-window counter: the previous window is weighted by overlap."""
+        now = time.monotonic()
+        index = math.floor(now / window)
+        elapsed = now / window - index
+        with self._lock:
+            start, current, previous = self._windows.pop(key, (index, 0, 0))
+            if start != index:
+                previous = current if start == index - 1 else 0
+                current = 0
+            estimate = previous * (1 - elapsed) + current
+            if estimate + cost <= limit:
+                allowed, retry_after = True, 0.0
+                current += cost
+            elif current + cost <= limit and previous:
+                # Wait until enough of the previous window has slid out.
+                allowed = False
+                needed = 1 - (limit - current - cost) / previous
+                retry_after = (needed - elapsed) * window
+            else:
+                allowed = False
+                retry_after = (1 - elapsed) * window
+            self._windows[key] = (index, current, previous)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        return allowed, retry_after
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+                self._windows.clear()
+            else:
+                self._buckets.pop(key, None)
+                self._windows.pop(key, None)
+
+
+BACKENDS = {"memory": InMemoryBackend}
+
+
+def create_backend(name="memory", **options):
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown rate limit backend '{name}' (expected one of: {', '.join(BACKENDS)})"
+        ) from None
+    return backend_cls(**options)
+
+
+class RateLimiter:
+    """A named token bucket: ``burst`` requests at once, ``per_minute`` sustained."""
+
+    def __init__(self, backend, name, *, burst, per_minute):
+        self.backend = backend
+        self.name = name
+        self.capacity = max(1, int(burst))
+        self.refill_rate = float(per_minute) / 60.0
+        self.rejected = 0
+
+    def hit(self, key, cost=1):
+        """Consume ``cost`` tokens for ``key``; returns ``(allowed, retry_after)``."""
+        allowed, retry_after = self.backend.take(
+            f"{self.name}:{key}", self.capacity, self.refill_rate, cost
+        )
+        if not allowed:
+            self.rejected += 1
+        return allowed, retry_after
+
+    def reset(self, key):
+        self.backend.reset(f"{self.name}:{key}")
+
+
+class SlidingWindowLimiter:
+    """At most ``limit`` hits per key in any ``window_seconds`` span (approximate)."""
+
+    def __init__(self, backend, name, *, limit, window_seconds):
+        self.backend = backend
+        self.name = name
+        self.limit = max(1, int(limit))
+        self.window = max(1.0, float(window_seconds))
+        self.rejected = 0
+
+    def hit(self, key, cost=1):
+        """Count ``cost`` hits for ``key``; returns ``(allowed, retry_after)``."""
+        allowed, retry_after = self.backend.count(
+            f"{self.name}:{key}", self.limit, self.window, cost
+        )
+        if not allowed:
+            self.rejected += 1
+        return allowed, retry_after
+
+    def reset(self, key):
+        self.backend.reset(f"{self.name}:{key}")
@@ -0,0 +1,173 @@
+"""Responsive image derivatives (WebP/AVIF, multiple widths) and a Jinja helper."""
+import hashlib
+import json
+import os
+
+from flask import send_from_directory, url_for
+from markupsafe import Markup, escape
+
+from lazy_imports import lazy_module
+
+# Optional and loaded on first build: without Pillow templates get plain lazy <img> tags.
+Image = lazy_module("PIL.Image")
+
+DEFAULT_WIDTHS = (96, 320, 640, 960, 1280, 1920)
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+INDEX_NAME = "index.json"
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+def available_formats():
+    """Return the derivative formats this Pillow build can encode, best first."""
+    if Image is None:
+        return []
+    Image.init()
+    return [fmt for fmt in ("avif", "webp") if fmt.upper() in Image.SAVE]
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def _render_variant(image, width, fmt, target):
+    height = max(1, round(image.height * width / image.width))
+    resized = image.resize((width, height), Image.LANCZOS)
+    if fmt == "avif":
+        resized.save(target, "AVIF", quality=55)
+    else:
+        resized.save(target, "WEBP", quality=80, method=6)
+
+
+class ResponsiveImages:
+    """Build derivatives into a cache dir and render ``<picture>`` markup."""
+
+    def __init__(self, app=None, *, cache_dir=None, widths=DEFAULT_WIDTHS,
+                 max_age=31536000, static_url_for=None):
+        self.cache_dir = cache_dir
+        self.static_url_for = static_url_for or url_for
+        self.widths = tuple(sorted(widths))
+        self.max_age = max_age
+        self.index = {}
+        self.static_folder = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if self.cache_dir is None:
+            self.cache_dir = os.path.join(app.instance_path, "image-cache")
+        self.static_folder = app.static_folder
+        self.load_index()
+        app.add_url_rule(
+            "/responsive/<path:filename>", "responsive_image", self.serve_derivative
+        )
+        app.jinja_env.globals["responsive_img"] = self.render
+
+    def load_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_NAME), "r", encoding="utf-8") as index_file:
+                self.index = json.load(index_file)
+        except (OSError, ValueError):
+            self.index = {}
+        return self.index
+
+    def build(self, subdir="images"):
+        """Generate missing derivatives; sources whose hash is unchanged are skipped.
+
+        Returns ``(generated, skipped)`` counts of source images.
+        """
+        formats = available_formats()
+        if not formats:
+            raise RuntimeError("Pillow with WebP or AVIF support is required to build images")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index = self.load_index()
+        generated = skipped = 0
+        source_root = os.path.join(self.static_folder, subdir)
+        for root, _dirs, files in os.walk(source_root):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() not in SOURCE_EXTENSIONS:
+                    continue
+                path = os.path.join(root, name)
+                logical = os.path.relpath(path, self.static_folder).replace(os.sep, "/")
+                source_hash = _file_hash(path)
+                entry = index.get(logical)
+                if (
+                    entry
+                    and entry["hash"] == source_hash
+                    and entry["formats"] == formats
+                    and all(
+                        os.path.exists(os.path.join(self.cache_dir, variant["file"]))
+                        for variant in entry["variants"]
+                    )
+                ):
+                    skipped += 1
+                    continue
+                index[logical] = self._build_one(path, logical, source_hash, formats)
+                generated += 1
+
+        with open(os.path.join(self.cache_dir, INDEX_NAME), "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file, indent=2, sort_keys=True)
+        self.index = index
+        return generated, skipped
+
+    def _build_one(self, path, logical, source_hash, formats):
+        stem = os.path.splitext(logical)[0].replace("/", "_").replace(" ", "-")
+        variants = []
+        with Image.open(path) as image:
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+                image = image.convert("RGBA" if has_alpha else "RGB")
+            widths = [w for w in self.widths if w < image.width] + [image.width]
+            for fmt in formats:
+                for width in widths:
+                    file_name = f"{stem}.{source_hash}.{width}w.{fmt}"
+                    _render_variant(image, width, fmt, os.path.join(self.cache_dir, file_name))
+                    variants.append({"file": file_name, "format": fmt, "width": width})
+            size = {"width": image.width, "height": image.height}
+        return {"hash": source_hash, "formats": formats, "variants": variants, **size}
+
+    def serve_derivative(self, filename):
+        response = send_from_directory(self.cache_dir, filename, max_age=self.max_age)
+        response.headers["Cache-Control"] = f"public, max-age={self.max_age}, immutable"
+        return response
+
+    def render(self, filename, alt="", *, sizes="100vw", class_="", loading="lazy",
+               fetchpriority=None):
+        """Return ``<picture>`` markup with ``srcset``/``sizes`` for ``filename``."""
+        entry = self.index.get(filename)
+        img_attrs = [
+            f'src="{escape(self.static_url_for("static", filename=filename))}"',
+            f'alt="{escape(alt)}"',
+            f'loading="{escape(loading)}"',
+            'decoding="async"',
+        ]
+        if class_:
+            img_attrs.append(f'class="{escape(class_)}"')
+        if fetchpriority:
+            img_attrs.append(f'fetchpriority="{escape(fetchpriority)}"')
+        if entry:
+            img_attrs.append(f'width="{entry["width"]}" height="{entry["height"]}"')
+        img_tag = f"<img {' '.join(img_attrs)} />"
+        if not entry:
+            return Markup(img_tag)
+
+        sources = []
+        for fmt in entry["formats"]:
+            srcset = ", ".join(
+                f'{url_for("responsive_image", filename=variant["file"])} {variant["width"]}w'
+                for variant in entry["variants"]
+                if variant["format"] == fmt
+            )
+            sources.append(
+                f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(srcset)}" '
+                f'sizes="{escape(sizes)}" />'
+            )
+        # display:contents keeps the <img> laid out exactly as without <picture>.
+        return Markup(
+            f'<picture style="display: contents">{"".join(sources)}{img_tag}</picture>'
+        )
@@ -0,0 +1,261 @@
+"""Typed, immutable runtime settings with atomic reload.
+
+Settings are parsed once from the environment (``.env`` included) into a
+frozen ``Settings`` snapshot. Hot paths call ``current()`` and read
+attributes; nothing is parsed per call. ``SettingsStore.reload()`` builds a
+new snapshot and swaps it in only if every value validates.
+"""
+import logging
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DOTENV_PATH = ".env"
+
+
+# --- .env loading ---
+def _resolve_dotenv_path(path):
+    if not os.path.isabs(path):
+        local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        if os.path.exists(local_path):
+            return local_path
+    return path
+
+
+def read_dotenv(path=DOTENV_PATH):
+    """Return the key/value pairs in ``path`` (``{}`` when it does not exist)."""
+    path = _resolve_dotenv_path(path)
+    if not os.path.exists(path):
+        return {}
+
+    values = {}
+    with open(path, "r", encoding="utf-8") as env_file:
+        for raw_line in env_file:
+            line = raw_line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            if key:
+                values[key] = value
+    return values
+
+
+def load_dotenv_file(path=DOTENV_PATH):
+    """Load .env key/value pairs into process env when not already set.
+
+    Returns the keys that were set, so a reload knows which ones it owns.
+    """
+    loaded = []
+    for key, value in read_dotenv(path).items():
+        if key not in os.environ:
+            os.environ[key] = value
+            loaded.append(key)
+    return loaded
+
+
+# --- Typed settings ---
+class SettingsError(ValueError):
+    pass
+
+
+def _setting(env, default, **rules):
+    return field(default=default, metadata={"env": env, **rules})
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Values that may change without a restart.
+
+    The SMTP pool is rebuilt on the next send when any ``smtp_*`` value
+    changes, pool size included. Worker, thread and process pool sizes are
+    fixed at startup and stay module constants in ``main.py``.
+    """
+
+    email_delivery_mode: str = _setting(
+        "EMAIL_DELIVERY_MODE", "mock", choices=("mock", "smtp"), lower=True
+    )
+    login_max_attempts: int = _setting("LOGIN_MAX_ATTEMPTS", 5, minimum=1)
+    login_lockout_minutes: int = _setting("LOGIN_LOCKOUT_MINUTES", 15, minimum=0)
+    smtp_server: str = _setting("SMTP_SERVER", "smtp.mail.yahoo.com")
+    smtp_port: int = _setting("SMTP_PORT", 587, minimum=1, maximum=65535)
+    smtp_username: str = _setting("SMTP_USERNAME", "")
+    smtp_password: str = _setting("SMTP_PASSWORD", "")
+    smtp_use_ssl: bool = _setting("SMTP_USE_SSL", False)
+    # Only disable for trusted local relays (e.g. the benchmark SMTP stub).
+    smtp_starttls: bool = _setting("SMTP_STARTTLS", True)
+    smtp_timeout: int = _setting("SMTP_TIMEOUT", 20, minimum=1)
+    smtp_pool_size: int = _setting("SMTP_POOL_SIZE", 2, minimum=1)
+    smtp_pool_idle_timeout: int = _setting("SMTP_POOL_IDLE_TIMEOUT", 60, minimum=0)
+    contact_to_address: str = _setting("CONTACT_TO_ADDRESS", "")
+    contact_from_address: str = _setting("CONTACT_FROM_ADDRESS", "")
+    contact_subject: str = _setting(
+        "CONTACT_SUBJECT", "Message from portfolio contact form"
+    )
+    name_api_timeout: float = _setting("NAME_API_TIMEOUT", 5.0, minimum=0.1)
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Parse every field from ``environ``; raise ``SettingsError`` listing all problems."""
+        environ = os.environ if environ is None else environ
+        values, errors = {}, []
+        for item in fields(cls):
+            name = item.metadata["env"]
+            raw = (environ.get(name) or "").strip()
+            if not raw:
+                # Unset and empty both mean "use the default".
+                continue
+            try:
+                values[item.name] = _parse(item, raw)
+            except ValueError as exc:
+                errors.append(f"{name}: {exc}")
+        if errors:
+            raise SettingsError("Invalid settings: " + "; ".join(errors))
+        return cls(**values)
+
+
+def _parse(item, raw):
+    rules = item.metadata
+    if item.type is bool:
+        if raw not in {"0", "1"}:
+            raise ValueError(f"expected 0 or 1, got {raw!r}")
+        return raw == "1"
+    if item.type in (int, float):
+        try:
+            value = item.type(raw)
+        except ValueError:
+            raise ValueError(f"expected {item.type.__name__}, got {raw!r}") from None
+        if "minimum" in rules and value < rules["minimum"]:
+            raise ValueError(f"must be at least {rules['minimum']}")
+        if "maximum" in rules and value > rules["maximum"]:
+            raise ValueError(f"must be at most {rules['maximum']}")
+        return value
+    value = raw.lower() if rules.get("lower") else raw
+    if "choices" in rules and value not in rules["choices"]:
+        raise ValueError(f"expected one of {', '.join(rules['choices'])}, got {raw!r}")
+    return value
+
+
+# --- Snapshot store ---
+class SettingsStore:
+    """Hold the current ``Settings`` snapshot and replace it on reload.
+
+    Reloads are requested by ``SIGHUP`` or noticed when ``.env`` changes
+    (checked at most every ``watch_interval`` seconds from ``maybe_reload``,
+    ``0`` disables). Variables set outside ``.env`` always win over it.
+    """
+
+    def __init__(self, dotenv_path=DOTENV_PATH, *, watch_interval=5.0):
+        self.dotenv_path = dotenv_path
+        self.watch_interval = watch_interval
+        self._snapshot = None
+        self._dotenv_keys = set()
+        self._mtime = None
+        self._next_check = 0.0
+        self._reload_requested = False
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.loaded_at = None
+        self.last_error = None
+
+    def _read_mtime(self):
+        try:
+            return os.stat(_resolve_dotenv_path(self.dotenv_path)).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """Load ``.env`` into the environment and build the first snapshot."""
+        with self._lock:
+            self._dotenv_keys = set(load_dotenv_file(self.dotenv_path))
+            self._mtime = self._read_mtime()
+            self._snapshot = Settings.from_env()
+            self.loaded_at = datetime.utcnow()
+            return self._snapshot
+
+    def current(self):
+        snapshot = self._snapshot
+        return snapshot if snapshot is not None else self.load()
+
+    def reload(self):
+        """Re-read ``.env`` and the environment. Returns ``True`` when swapped in.
+
+        An invalid configuration is logged and the previous snapshot is kept.
+        """
+        with self._lock:
+            self._mtime = self._read_mtime()
+            values = read_dotenv(self.dotenv_path)
+            owned = {
+                key for key in values if key in self._dotenv_keys or key not in os.environ
+            }
+            environ = dict(os.environ)
+            for key in self._dotenv_keys - owned:
+                environ.pop(key, None)
+            environ.update({key: values[key] for key in owned})
+            try:
+                snapshot = Settings.from_env(environ)
+            except SettingsError as exc:
+                self.last_error = str(exc)
+                logger.error("Settings reload rejected, keeping previous values: %s", exc)
+                return False
+
+            for key in self._dotenv_keys - owned:
+                os.environ.pop(key, None)
+            for key in owned:
+                os.environ[key] = values[key]
+            self._dotenv_keys = owned
+            self._snapshot = snapshot
+            self.reloads += 1
+            self.loaded_at = datetime.utcnow()
+            self.last_error = None
+            logger.info("Settings reloaded")
+            return True
+
+    def request_reload(self, *_):
+        # Signal-safe: only set a flag; the next maybe_reload() does the work.
+        self._reload_requested = True
+
+    def maybe_reload(self):
+        """Reload if ``SIGHUP`` arrived or ``.env`` changed since the last look."""
+        if self._reload_requested:
+            self._reload_requested = False
+            return self.reload()
+        if not self.watch_interval:
+            return False
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.watch_interval
+        if self._read_mtime() == self._mtime:
+            return False
+        return self.reload()
+
+    def install_signal_handler(self):
+        """Request a reload on ``SIGHUP`` (POSIX only, main thread only)."""
+        if not hasattr(signal, "SIGHUP"):
+            return False
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signal.SIGHUP, self.request_reload)
+        return True
+
+    def stats(self):
+        return {
+            "reloads": self.reloads,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "last_error": self.last_error,
+        }
+
+
+store = SettingsStore()
+
+
+def current():
+    """Return the current settings snapshot, loading it on first use."""
+    return store.current()
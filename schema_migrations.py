@@ -0,0 +1,130 @@
+"""Ordered schema migrations tracked in a ``schema_version`` table.
+
+Scripts live in ``migrations/`` as ``NNNN_description.py`` and define
+``upgrade(engine, context)``. Each one runs once, in version order, and is
+recorded in ``schema_version`` right after it succeeds.
+"""
+import importlib.util
+import logging
+import os
+import re
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+_FILENAME = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(120), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def discover(path=MIGRATIONS_DIR):
+    """Return ``[(version, name, module)]`` sorted by version."""
+    found = []
+    for filename in sorted(os.listdir(path)):
+        match = _FILENAME.match(filename)
+        if not match:
+            continue
+        spec = importlib.util.spec_from_file_location(
+            f"migrations_{match.group(1)}", os.path.join(path, filename)
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        found.append((int(match.group(1)), match.group(2), module))
+    versions = [version for version, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {path}")
+    return found
+
+
+def latest_version(path=MIGRATIONS_DIR):
+    versions = [
+        int(match.group(1))
+        for match in map(_FILENAME.match, os.listdir(path))
+        if match
+    ]
+    return max(versions, default=0)
+
+
+def current_version(engine):
+    """Read the applied version with one query; ``0`` when never migrated."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return 0
+
+
+def upgrade(engine, context, path=MIGRATIONS_DIR):
+    """Apply every pending migration. Returns the list of applied versions."""
+    _metadata.create_all(engine, checkfirst=True)
+    applied = []
+    version = current_version(engine)
+    for number, name, module in discover(path):
+        if number <= version:
+            continue
+        logger.info("Applying migration %04d_%s", number, name)
+        module.upgrade(engine, context)
+        with engine.begin() as conn:
+            conn.execute(
+                schema_version.insert().values(
+                    version=number, name=name, applied_at=datetime.utcnow()
+                )
+            )
+        applied.append(number)
+    return applied
+
+
+# --- Helpers for migration scripts ---
+def add_column(engine, table_name, column_name, ddl):
+    """``ALTER TABLE ... ADD COLUMN`` unless the column already exists."""
+    columns = {column["name"] for column in inspect(engine).get_columns(table_name)}
+    if column_name in columns:
+        return False
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}"))
+    return True
+
+
+def create_index_online(engine, index):
+    """Create ``index`` if missing without blocking writers longer than needed.
+
+    PostgreSQL builds it ``CONCURRENTLY`` outside a transaction. SQLite has no
+    online build, so each index gets its own short transaction.
+    """
+    existing = {
+        item["name"] for item in inspect(engine).get_indexes(index.table.name)
+    }
+    if index.name in existing:
+        return False
+    if engine.dialect.name == "postgresql":
+        index.dialect_options["postgresql"]["concurrently"] = True
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        index.dialect_options["postgresql"]["concurrently"] = False
+    else:
+        with engine.begin() as conn:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+    return True
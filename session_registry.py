@@ -0,0 +1,69 @@
+"""Expiry sweeps and cheap per-request revocation checks for login sessions."""
+import os
+import threading
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+
+def sweep_expired_sessions(session, model, lifetime, batch_size=1000):
+    """Mark ``active`` sessions older than ``lifetime`` as ``expired`` in batches.
+
+    Returns the number of rows updated.
+    """
+    now = datetime.utcnow()
+    cutoff = now - lifetime
+    swept = 0
+    while True:
+        batch = (
+            select(model.id)
+            .where(model.status == "active", model.login_at < cutoff)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = session.execute(
+            update(model)
+            .where(model.id.in_(batch))
+            .values(status="expired", logout_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        swept += result.rowcount
+        if result.rowcount < batch_size:
+            return swept
+
+
+class SessionRevocations:
+    """In-memory set of revoked session ids, reloaded when a stamp file changes.
+
+    Checking a request costs one ``stat`` and a set lookup; the database is
+    only read after some process called ``mark_changed``.
+    """
+
+    def __init__(self, loader, stamp_path):
+        self.loader = loader
+        self.stamp_path = stamp_path
+        self._revoked = frozenset()
+        self._stamp = object()
+        self._lock = threading.Lock()
+
+    def _read_stamp(self):
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def is_revoked(self, session_id):
+        stamp = self._read_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._revoked = frozenset(self.loader())
+                    self._stamp = stamp
+        return session_id in self._revoked
+
+    def mark_changed(self):
+        """Signal every process to reload the revoked set."""
+        with open(self.stamp_path, "a", encoding="utf-8"):
+            pass
+        os.utime(self.stamp_path)
@@ -0,0 +1,165 @@
+"""Opt-in per-request SQL profiler with N+1 detection and slow-query plans."""
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+# "IN (?, ?, ?)" from expanding parameters: one shape regardless of length.
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def normalize_statement(statement):
+    """Collapse whitespace and placeholder lists so repeats share one key."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(?)", statement)
+
+
+class SQLProfiler:
+    """Record statement count and time per request, plus process-wide hot spots.
+
+    A statement is slow at ``slow_ms`` or more. Its ``EXPLAIN QUERY PLAN``
+    (``EXPLAIN`` elsewhere) is captured once per statement shape and logged.
+    A request that runs one shape ``n_plus_one_threshold`` times or more is
+    reported as a likely N+1. At most ``max_statements`` shapes are kept;
+    the one with the least total time is dropped first.
+    """
+
+    def __init__(self, *, slow_ms=100, n_plus_one_threshold=5, max_statements=50,
+                 max_reports=20):
+        self.slow_seconds = slow_ms / 1000.0
+        self.n_plus_one_threshold = max(2, int(n_plus_one_threshold))
+        self.max_statements = max(1, int(max_statements))
+        self.max_reports = max(1, int(max_reports))
+        self._statements = {}
+        self._n_plus_one = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self, engine):
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["profiler_started"].pop()
+            self._record(conn, statement, parameters, executemany, elapsed)
+
+    # --- Per request ---
+    def begin(self):
+        self._local.request = {"queries": 0, "seconds": 0.0, "shapes": {}}
+
+    def end(self, label):
+        """Return ``(queries, seconds)`` since ``begin`` and report N+1 shapes."""
+        current = getattr(self._local, "request", None)
+        self._local.request = None
+        if current is None:
+            return 0, 0.0
+        repeated = {
+            shape: count
+            for shape, count in current["shapes"].items()
+            if count >= self.n_plus_one_threshold
+        }
+        for shape, count in repeated.items():
+            logger.warning("Possible N+1 in %s: %s statement(s) of %s", label, count, shape)
+            with self._lock:
+                self._n_plus_one.insert(0, {
+                    "route": label,
+                    "count": count,
+                    "statement": shape,
+                    "seen_at": datetime.utcnow().isoformat(),
+                })
+                del self._n_plus_one[self.max_reports:]
+        return current["queries"], current["seconds"]
+
+    # --- Recording ---
+    def _record(self, conn, statement, parameters, executemany, elapsed):
+        shape = normalize_statement(statement)
+        current = getattr(self._local, "request", None)
+        if current is not None:
+            current["queries"] += 1
+            current["seconds"] += elapsed
+            current["shapes"][shape] = current["shapes"].get(shape, 0) + 1
+
+        slow = elapsed >= self.slow_seconds
+        with self._lock:
+            stats = self._statements.get(shape)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    coldest = min(
+                        self._statements, key=lambda key: self._statements[key]["total"]
+                    )
+                    del self._statements[coldest]
+                stats = self._statements[shape] = {
+                    "count": 0, "total": 0.0, "max": 0.0, "slow": 0, "plan": None,
+                }
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+            stats["slow"] += slow
+            needs_plan = slow and stats["plan"] is None
+        if not slow:
+            return
+        plan = None
+        if needs_plan and not executemany:
+            plan = self._explain(conn, statement, parameters)
+            with self._lock:
+                if shape in self._statements:
+                    self._statements[shape]["plan"] = plan
+        logger.warning(
+            "Slow query (%.1f ms): %s%s",
+            elapsed * 1000,
+            shape,
+            "".join(f"\n  {line}" for line in plan or ()),
+        )
+
+    def _explain(self, conn, statement, parameters):
+        """Run the plan on the raw DBAPI connection so no events fire again."""
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+        except Exception:
+            logger.debug("EXPLAIN failed for %s", statement, exc_info=True)
+            return None
+        finally:
+            cursor.close()
+
+    # --- Reporting ---
+    def top(self, limit=20, order_by="total"):
+        """Return the ``limit`` shapes with the highest ``total``, ``max`` or ``count``."""
+        with self._lock:
+            items = [(shape, dict(stats)) for shape, stats in self._statements.items()]
+            n_plus_one = list(self._n_plus_one)
+        items.sort(key=lambda item: item[1][order_by], reverse=True)
+        return {
+            "statements": [
+                {
+                    "statement": shape,
+                    "count": stats["count"],
+                    "total_ms": round(stats["total"] * 1000, 2),
+                    "mean_ms": round(stats["total"] * 1000 / stats["count"], 2),
+                    "max_ms": round(stats["max"] * 1000, 2),
+                    "slow": stats["slow"],
+                    "plan": stats["plan"],
+                }
+                for shape, stats in items[:limit]
+            ],
+            "n_plus_one": n_plus_one,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._n_plus_one.clear()
@@ -0,0 +1,77 @@
+"""SQLite engine profile: pragmas applied on connect plus pool settings."""
+import os
+import sqlite3
+
+from sqlalchemy import event
+
+PROFILES = {
+    # SQLite defaults: rollback journal, synchronous=FULL, no busy timeout.
+    "default": {},
+    "performance": {
+        # Only takes effect for new database files (or after a one-off VACUUM).
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -20000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def is_sqlite_uri(uri):
+    return bool(uri) and uri.startswith("sqlite")
+
+
+def load_profile():
+    """Return ``(name, pragmas)`` for ``SQLITE_PROFILE`` with env overrides."""
+    name = os.getenv("SQLITE_PROFILE", "performance").strip().lower()
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_PROFILE '{name}' (expected one of: {', '.join(PROFILES)})"
+        )
+    pragmas = dict(PROFILES[name])
+    overrides = {
+        "busy_timeout": "SQLITE_BUSY_TIMEOUT_MS",
+        "cache_size": "SQLITE_CACHE_SIZE",
+        "mmap_size": "SQLITE_MMAP_SIZE",
+        "synchronous": "SQLITE_SYNCHRONOUS",
+    }
+    for pragma, env_name in overrides.items():
+        value = (os.getenv(env_name) or "").strip()
+        if value:
+            pragmas[pragma] = value
+    return name, pragmas
+
+
+def engine_options(uri, pragmas):
+    """Return ``SQLALCHEMY_ENGINE_OPTIONS`` suited to multi-threaded servers."""
+    if not is_sqlite_uri(uri) or not pragmas:
+        return {}
+    busy_seconds = int(pragmas.get("busy_timeout", 5000)) / 1000
+    options = {"connect_args": {"check_same_thread": False, "timeout": busy_seconds}}
+    if ":memory:" not in uri and "mode=memory" not in uri:
+        options.update(
+            pool_size=int(os.getenv("SQLITE_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("SQLITE_POOL_MAX_OVERFLOW", "20")),
+            pool_timeout=float(os.getenv("SQLITE_POOL_TIMEOUT", "10")),
+        )
+    return options
+
+
+def install(engine, pragmas):
+    """Run the profile pragmas on every new DBAPI connection of ``engine``."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
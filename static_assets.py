@@ -0,0 +1,164 @@
+"""Fingerprinted, precompressed static assets and the ``url_for`` override."""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+
+from flask import abort, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip siblings are built without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".map", ".ttf", ".eot"}
+MANIFEST_NAME = "manifest.json"
+_CSS_URL = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def _hashed_name(logical_name, data):
+    root, ext = posixpath.splitext(logical_name)
+    return f"{root}.{_digest(data)}{ext}"
+
+
+def _rewrite_css_urls(css_text, css_name, manifest):
+    """Point relative ``url(...)`` references at their fingerprinted names."""
+    css_dir = posixpath.dirname(css_name)
+
+    def replace(match):
+        quote, target = match.groups()
+        cut = min(
+            (i for i in (target.find("?"), target.find("#")) if i >= 0),
+            default=len(target),
+        )
+        path, suffix = target[:cut], target[cut:]
+        if not path or path.startswith(("data:", "http:", "https:", "//", "/")):
+            return match.group(0)
+        logical = posixpath.normpath(posixpath.join(css_dir, path))
+        hashed = manifest.get(logical)
+        if hashed is None:
+            return match.group(0)
+        rel = posixpath.relpath(hashed, css_dir or ".")
+        return f"url({quote}{rel}{suffix}{quote})"
+
+    return _CSS_URL.sub(replace, css_text)
+
+
+def _write_compressed(path, data):
+    if len(data) < 512:
+        return
+    with open(path + ".gz", "wb") as gz_file:
+        gz_file.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as br_file:
+            br_file.write(brotli.compress(data, quality=11))
+
+
+def build_assets(static_dir, output_dir):
+    """Copy ``static_dir`` into ``output_dir`` with content-hashed names.
+
+    CSS is processed last so its relative ``url()`` references can be
+    rewritten to the hashed names. Returns the ``{logical: hashed}`` manifest,
+    which is also written to ``output_dir/manifest.json``.
+    """
+    static_dir = os.path.abspath(static_dir)
+    output_dir = os.path.abspath(output_dir)
+    sources = []
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != output_dir]
+        for name in files:
+            full_path = os.path.join(root, name)
+            logical = os.path.relpath(full_path, static_dir).replace(os.sep, "/")
+            sources.append((logical, full_path))
+    sources.sort(key=lambda item: (item[0].endswith(".css"), item[0]))
+
+    if os.path.isdir(output_dir):
+        shutil.rmtree(output_dir)
+    manifest = {}
+    for logical, full_path in sources:
+        with open(full_path, "rb") as source:
+            data = source.read()
+        if logical.endswith(".css"):
+            data = _rewrite_css_urls(data.decode("utf-8"), logical, manifest).encode(
+                "utf-8"
+            )
+        hashed = _hashed_name(logical, data)
+        target = os.path.join(output_dir, *hashed.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as out:
+            out.write(data)
+        if posixpath.splitext(logical)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            _write_compressed(target, data)
+        manifest[logical] = hashed
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=2, sort_keys=True)
+    return manifest
+
+
+class StaticAssets:
+    """Serve the built asset tree and map ``url_for('static', ...)`` onto it."""
+
+    def __init__(self, app=None, *, output_dir=None, max_age=31536000):
+        self.output_dir = output_dir
+        self.max_age = max_age
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if self.output_dir is None:
+            self.output_dir = os.path.join(app.static_folder, "dist")
+        self.load_manifest()
+        app.add_url_rule(
+            "/assets/<path:filename>", "hashed_static", self.serve_asset
+        )
+        app.jinja_env.globals["url_for"] = self.url_for
+
+    def load_manifest(self):
+        manifest_path = os.path.join(self.output_dir, MANIFEST_NAME)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+                self.manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            self.manifest = {}
+        return self.manifest
+
+    def url_for(self, endpoint, **values):
+        """Drop-in ``url_for`` that prefers fingerprinted static files."""
+        if endpoint == "static":
+            hashed = self.manifest.get(values.get("filename", ""))
+            if hashed:
+                values["filename"] = hashed
+                return url_for("hashed_static", **values)
+        return url_for(endpoint, **values)
+
+    def serve_asset(self, filename):
+        if posixpath.normpath(filename) == MANIFEST_NAME:
+            abort(404)
+        encodings = request.accept_encodings
+        served_name, encoding = filename, None
+        for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encodings[candidate] and os.path.isfile(
+                os.path.join(self.output_dir, *(filename + suffix).split("/"))
+            ):
+                served_name, encoding = filename + suffix, candidate
+                break
+
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = send_from_directory(
+            self.output_dir, served_name, mimetype=mimetype, max_age=self.max_age
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = f"public, max-age={self.max_age}, immutable"
+        return response
@@ -0,0 +1,167 @@
+"""Bulk user import/export: parsing, one-pass validation and chunked inserts."""
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+IMPORT_CHUNK_SIZE = 500
+EXPORT_COLUMNS = ["id", "username", "enabled", "is_admin", "created_at"]
+_TRUE = {"1", "true", "yes", "y", "on"}
+_FALSE = {"0", "false", "no", "n", "off"}
+
+
+def parse_users(payload, fmt):
+    """Parse CSV or JSON text into a list of row dicts."""
+    if fmt == "json":
+        data = json.loads(payload)
+        if isinstance(data, dict):
+            data = data.get("users", [])
+        if not isinstance(data, list):
+            raise ValueError("JSON import must be a list of user objects")
+        return [row if isinstance(row, dict) else {} for row in data]
+    if fmt == "csv":
+        return list(csv.DictReader(io.StringIO(payload)))
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def _parse_flag(value, default):
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if not lowered:
+        return default
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError(f"invalid boolean '{value}'")
+
+
+def validate_users(rows, existing_usernames, min_password_length=8):
+    """Check every row in one pass against the file and ``existing_usernames``.
+
+    Returns ``(valid, errors)``: ``valid`` rows are normalised dicts with
+    ``row``, ``username``, ``enabled``, ``is_admin`` and either ``password``
+    or ``password_hash``; ``errors`` holds ``{"row", "username", "error"}``
+    entries with 1-based row numbers.
+    """
+    seen = set(existing_usernames)
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        username = str(row.get("username") or "").strip()
+        password = str(row.get("password") or "")
+        password_hash = str(row.get("password_hash") or "").strip()
+
+        def reject(message):
+            errors.append({"row": number, "username": username, "error": message})
+
+        if not username:
+            reject("username is required")
+            continue
+        if len(username) > 120:
+            reject("username is longer than 120 characters")
+            continue
+        if username in seen:
+            reject("duplicate username")
+            continue
+        if not password_hash and len(password) < min_password_length:
+            reject(f"password must be at least {min_password_length} characters")
+            continue
+        try:
+            enabled = _parse_flag(row.get("enabled"), True)
+            is_admin = _parse_flag(row.get("is_admin"), False)
+        except ValueError as exc:
+            reject(str(exc))
+            continue
+
+        seen.add(username)
+        valid.append(
+            {
+                "row": number,
+                "username": username,
+                "password": password,
+                "password_hash": password_hash,
+                "enabled": enabled,
+                "is_admin": is_admin,
+            }
+        )
+    return valid, errors
+
+
+def insert_users(session, table, rows, hash_many, chunk_size=IMPORT_CHUNK_SIZE):
+    """Hash plain passwords in parallel and insert ``rows`` in chunked transactions.
+
+    A chunk that hits a unique constraint (a user created since validation)
+    is rolled back and retried row by row. Returns ``(inserted, errors)`` with
+    errors shaped like ``validate_users``'.
+    """
+    to_hash = [row for row in rows if not row["password_hash"]]
+    for row, password_hash in zip(to_hash, hash_many([row["password"] for row in to_hash])):
+        row["password_hash"] = password_hash
+
+    now = datetime.utcnow()
+    inserted, errors = 0, []
+    for offset in range(0, len(rows), chunk_size):
+        source = rows[offset : offset + chunk_size]
+        chunk = [
+            {
+                "username": row["username"],
+                "password_hash": row["password_hash"],
+                "enabled": row["enabled"],
+                "is_admin": row["is_admin"],
+                "failed_login_attempts": 0,
+                "created_at": now,
+            }
+            for row in source
+        ]
+        try:
+            session.execute(insert(table), chunk)
+            session.commit()
+            inserted += len(chunk)
+            continue
+        except IntegrityError:
+            session.rollback()
+
+        for row, values in zip(source, chunk):
+            try:
+                session.execute(insert(table), [values])
+                session.commit()
+                inserted += 1
+            except IntegrityError:
+                session.rollback()
+                errors.append(
+                    {"row": row["row"], "username": row["username"],
+                     "error": "duplicate username"}
+                )
+    return inserted, errors
+
+
+def export_lines(users, fmt, columns=EXPORT_COLUMNS):
+    """Yield an export of ``users`` as CSV or a JSON array, row by row."""
+    def values(user):
+        row = {}
+        for name in columns:
+            value = getattr(user, name)
+            row[name] = value.isoformat() if isinstance(value, datetime) else value
+        return row
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for user in users:
+            writer.writerow(values(user))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        return
+
+    yield "["
+    for index, user in enumerate(users):
+        yield ("," if index else "") + json.dumps(values(user))
+    yield "]\n"
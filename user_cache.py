@@ -0,0 +1,145 @@
+"""Short-TTL cache of user rows for the Flask-Login ``user_loader``."""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached, object_session
+
+
+class UserCache:
+    """Cache column snapshots of a model by primary key.
+
+    Cached rows are re-attached with ``session.merge(load=False)`` so callers
+    get a normal persistent instance without a SELECT. Changes committed
+    through the ORM invalidate the entry. When one of ``shared_fields``
+    changes, ``stamp_path`` is touched, which clears the cache in every
+    process that shares it.
+    """
+
+    def __init__(self, model, *, ttl=30, maxsize=10000, stamp_path=None,
+                 shared_fields=()):
+        self.model = model
+        self.shared_fields = tuple(shared_fields)
+        self.ttl = ttl
+        self.maxsize = max(1, int(maxsize))
+        self.stamp_path = stamp_path
+        self._columns = [attr.key for attr in inspect(model).column_attrs]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp = self._read_stamp()
+        self.hits = 0
+        self.misses = 0
+
+    # --- Cross-process invalidation ---
+    def _read_stamp(self):
+        if not self.stamp_path:
+            return None
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _touch_stamp(self):
+        if not self.stamp_path:
+            return
+        with open(self.stamp_path, "a", encoding="utf-8"):
+            pass
+        os.utime(self.stamp_path)
+
+    def _check_stamp(self):
+        stamp = self._read_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                self._entries.clear()
+                self._stamp = stamp
+
+    # --- Lookup ---
+    def get(self, session, user_id):
+        """Return the user attached to ``session``, loading it on a miss."""
+        if self.ttl <= 0:
+            return session.get(self.model, user_id)
+
+        self._check_stamp()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                values = entry[0]
+            else:
+                values = None
+
+        if values is None:
+            self.misses += 1
+            user = session.get(self.model, user_id)
+            if user is not None:
+                self._remember(user)
+            return user
+
+        self.hits += 1
+        instance = self.model(**values)
+        make_transient_to_detached(instance)
+        return session.merge(instance, load=False)
+
+    def _remember(self, user):
+        values = {name: getattr(user, name) for name in self._columns}
+        with self._lock:
+            self._entries[values["id"]] = (values, time.monotonic() + self.ttl)
+            self._entries.move_to_end(values["id"])
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids, everywhere=True):
+        """Forget ``user_ids``; with ``everywhere`` also signal other processes."""
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+        if everywhere:
+            self._touch_stamp()
+            self._stamp = self._read_stamp()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {"entries": size, "hits": self.hits, "misses": self.misses}
+
+    # --- ORM hooks ---
+    def watch(self, session_factory):
+        """Invalidate users changed in a session once its transaction commits."""
+        pending_key = "user_cache_pending"
+
+        def remember_change(target, shared):
+            target_session = object_session(target)
+            if target_session is None:
+                return
+            pending = target_session.info.setdefault(pending_key, {})
+            pending[target.id] = pending.get(target.id, False) or shared
+
+        def on_update(_mapper, _connection, target):
+            state = inspect(target)
+            shared = any(
+                state.attrs[name].history.has_changes() for name in self.shared_fields
+            )
+            remember_change(target, shared)
+
+        def on_delete(_mapper, _connection, target):
+            remember_change(target, True)
+
+        event.listen(self.model, "after_update", on_update)
+        event.listen(self.model, "after_delete", on_delete)
+
+        @event.listens_for(session_factory, "after_commit")
+        def invalidate_committed(session):
+            changed = session.info.pop(pending_key, None)
+            if changed:
+                self.invalidate(*changed, everywhere=any(changed.values()))
+
+        @event.listens_for(session_factory, "after_rollback")
+        def discard_pending(session):
+            session.info.pop(pending_key, None)
@@ -0,0 +1,96 @@
+"""Trigram search index for usernames, kept in sync by SQLite triggers."""
+import logging
+
+from sqlalchemy import Integer, column, text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# The trigram tokenizer cannot match terms shorter than this.
+MIN_FTS_QUERY_LENGTH = 3
+
+_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        username, content='users', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, username) VALUES (new.id, new.username);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username)
+        VALUES ('delete', old.id, old.username);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF username ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username)
+        VALUES ('delete', old.id, old.username);
+        INSERT INTO users_fts(rowid, username) VALUES (new.id, new.username);
+    END
+    """,
+)
+
+
+class UserSearchIndex:
+    """FTS5 trigram side index over ``users.username`` (SQLite only)."""
+
+    def __init__(self):
+        # None until ``ensure`` or ``detect`` has looked at the database.
+        self.available = None
+
+    def detect(self, engine):
+        """Check once whether the index exists, without creating anything."""
+        if engine.dialect.name != "sqlite":
+            self.available = False
+            return False
+        with engine.connect() as conn:
+            self.available = conn.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'users_fts'"
+                )
+            ).first() is not None
+        return self.available
+
+    def ensure(self, engine):
+        """Create the index and triggers if missing; backfill on first creation."""
+        if engine.dialect.name != "sqlite":
+            self.available = False
+            return False
+        try:
+            with engine.begin() as conn:
+                existed = conn.execute(
+                    text(
+                        "SELECT 1 FROM sqlite_master "
+                        "WHERE type = 'table' AND name = 'users_fts'"
+                    )
+                ).first()
+                for statement in _SCHEMA:
+                    conn.execute(text(statement))
+                if not existed:
+                    conn.execute(text("INSERT INTO users_fts(users_fts) VALUES ('rebuild')"))
+        except OperationalError as exc:
+            # SQLite builds without FTS5/trigram fall back to ILIKE scans.
+            logger.warning("Username search index unavailable: %s", exc)
+            self.available = False
+            return False
+        self.available = True
+        return True
+
+    def can_search(self, query_text):
+        return self.available and len(query_text) >= MIN_FTS_QUERY_LENGTH
+
+    @staticmethod
+    def match_ids(query_text):
+        """Return a ``SELECT rowid`` clause matching ``query_text`` as a substring."""
+        phrase = '"' + query_text.replace('"', '""') + '"'
+        return (
+            text("SELECT rowid FROM users_fts WHERE users_fts MATCH :phrase")
+            .bindparams(phrase=phrase)
+            .columns(column("rowid", Integer))
+        )